@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for the simulation and the renderer.
+
+Runs a set of canned scenarios and reports simulation ticks/sec, render
+time per frame (updating particle effects and painting GameWidget into
+a QImage on the offscreen Qt platform) and peak Python memory, as JSON:
+
+    python turret_bench.py --output bench.json
+    python turret_bench.py --baseline bench.json --threshold 0.15
+
+With --baseline the run fails (exit code 1) when any scenario is slower
+than the baseline by more than the threshold fraction. Every run also
+fails when a scenario's memory keeps growing once it is warmed up: the
+simulation is meant to reach a steady state where ticks allocate nothing
+that outlives them.
+
+--startup instead imports each STARTUP_BUDGETS module in a fresh
+interpreter under `python -X importtime` and fails when one takes longer
+than its budget, or when a module that must stay Qt-free pulls in PyQt5:
+
+    python turret_bench.py --startup
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tracemalloc
+
+from turret_sim import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, MAX_ENEMIES, MAX_HEALTH, MAX_LEVEL, GameEngine, TickInput,
+    PowerUp
+)
+from turret_bot import Autopilot
+from turret_worker import capture_frame
+
+BENCH_SEED = 1234
+HERE = os.path.dirname(os.path.abspath(__file__))
+# module -> (import time budget in ms, whether it may import Qt)
+STARTUP_BUDGETS = {
+    "turret_sim": (40, False),
+    "turret_scores": (30, False),
+    "turret_game": (50, False),
+    "turret_ui": (130, True),
+    "turret_view": (160, True),
+}
+STARTUP_RUNS = 5  # Fresh interpreters per module; the fastest run counts
+GROWTH_WINDOWS = 3     # Traced windows after warm-up; the first one only settles tracemalloc
+GROWTH_SLACK_KIB = 4   # Gain per window still taken as noise
+
+def sweep_input(engine, space_held=False):
+    """Aim sweeps across the top half of the screen, firing every few ticks."""
+    t = engine.tick
+    return TickInput((t * 7) % SCREEN_WIDTH, SCREEN_HEIGHT // 4,
+                     clicks=1 if t % 8 == 0 else 0, space_held=space_held)
+
+def idle_input(engine):
+    return TickInput(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 4)
+
+def setup_empty(engine):
+    engine.scheduler.cancel(engine.enemy_spawn_job)
+    engine.scheduler.cancel(engine.powerup_spawn_job)
+
+def setup_swarm(engine):
+    engine.scheduler.cancel(engine.powerup_spawn_job)
+
+def top_up_swarm(engine):
+    while len(engine.enemies) < MAX_ENEMIES:
+        engine.spawn_enemy()
+
+def top_up_rapid_fire(engine):
+    if not engine.rapid_fire:
+        engine.start_rapid_fire(3600.0)
+
+def top_up_combo(engine):
+    top_up_swarm(engine)
+    top_up_rapid_fire(engine)
+
+def setup_powerups(engine):
+    setup_empty(engine)
+    engine.turret.set_position(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 10)
+    # Past MAX_POWERUPS and never expiring: this scenario measures drawing them
+    for _ in range(50):
+        engine.powerups.append(PowerUp(engine.rng))
+    engine.powerup_grid_dirty = True
+    # Keep them all on the field: nothing may be picked up
+    for p in engine.powerups:
+        p.y = min(p.y, SCREEN_HEIGHT - 120)
+
+def setup_max_level(engine):
+    engine.set_level(MAX_LEVEL)
+
+autopilot = Autopilot()
+
+# name -> (setup, per-tick hook, input source)
+SCENARIOS = {
+    "empty": (setup_empty, None, idle_input),
+    "swarm": (setup_swarm, top_up_swarm, sweep_input),
+    "rapid_fire": (None, top_up_rapid_fire, lambda e: sweep_input(e, space_held=True)),
+    "powerups": (setup_powerups, None, idle_input),
+    "max_level": (setup_max_level, top_up_swarm, sweep_input),
+    "combo": (setup_swarm, top_up_combo, lambda e: sweep_input(e, space_held=True)),
+    "autopilot": (setup_max_level, top_up_swarm, autopilot.control),
+}
+
+def make_engine(name):
+    setup, hook, source = SCENARIOS[name]
+    engine = GameEngine(seed=BENCH_SEED)
+    if setup is not None:
+        setup(engine)
+    return engine, hook, source
+
+def tick(engine, hook, source):
+    engine.health = MAX_HEALTH  # Benchmarks must never reach game over
+    if hook is not None:
+        hook(engine)
+    return engine.step(source(engine))
+
+def run_ticks(engine, hook, source, ticks):
+    for _ in range(ticks):
+        tick(engine, hook, source)
+
+def bench_sim(name, ticks):
+    engine, hook, source = make_engine(name)
+    run_ticks(engine, hook, source, ticks // 10)  # Warm up caches
+    start = time.perf_counter()
+    run_ticks(engine, hook, source, ticks)
+    elapsed = time.perf_counter() - start
+    return {
+        "ticks_per_sec": round(ticks / elapsed, 1),
+        "entities": len(engine.enemies) + len(engine.bullets) + len(engine.powerups),
+    }
+
+def bench_memory(name, ticks):
+    engine, hook, source = make_engine(name)
+    tracemalloc.start()
+    run_ticks(engine, hook, source, ticks)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+def bench_growth(name, ticks):
+    """
+    Smallest net memory gain, in KiB, over the traced windows of ticks
+    each that follow a warm-up. Level-ups and filling the entity stores
+    allocate once; a leak gains in every window.
+    """
+    engine, hook, source = make_engine(name)
+    run_ticks(engine, hook, source, ticks * 2)
+    tracemalloc.start()
+    run_ticks(engine, hook, source, ticks)  # Replaces objects allocated before tracing
+    gains = []
+    for _ in range(GROWTH_WINDOWS - 1):
+        before = tracemalloc.get_traced_memory()[0]
+        run_ticks(engine, hook, source, ticks)
+        gains.append(tracemalloc.get_traced_memory()[0] - before)
+    tracemalloc.stop()
+    return round(min(gains) / 1024, 1)
+
+def load_ui():
+    """Import the Qt game view, or return None when PyQt5 is missing."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+    except ImportError:
+        return None
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    import turret_view as ui
+    ui.app = app
+    return ui
+
+def bench_render(ui, name, frames):
+    from PyQt5.QtGui import QImage
+    engine, hook, source = make_engine(name)
+    widget = ui.GameWidget(quality="full")  # Same tier every run
+    widget.stop()
+    image = QImage(SCREEN_WIDTH, SCREEN_HEIGHT, QImage.Format_ARGB32_Premultiplied)
+    particles = widget.particles
+    total = 0.0
+    for _ in range(frames):
+        events = tick(engine, hook, source)
+        start = time.perf_counter()
+        for event, value in events:
+            if event in ui.EFFECT_EVENTS:
+                particles.effect(event, value)
+        particles.update(engine.dt)
+        widget.drawn_frame = capture_frame(engine)
+        widget.render_hud_layer()
+        widget.render(image)
+        total += time.perf_counter() - start
+    widget.deleteLater()
+    return round(total / frames * 1000, 3)
+
+def run(names, ticks, frames):
+    ui = load_ui() if frames else None
+    results = {}
+    for name in names:
+        result = bench_sim(name, ticks)
+        result["peak_kib"] = bench_memory(name, ticks // 4)
+        result["growth_kib"] = bench_growth(name, ticks // 4)
+        result["render_ms"] = bench_render(ui, name, frames) if ui is not None else None
+        results[name] = result
+        print(f"{name:12s} {result['ticks_per_sec']:>10.0f} ticks/s  "
+              f"render {result['render_ms']} ms  peak {result['peak_kib']} KiB  "
+              f"growth {result['growth_kib']} KiB", file=sys.stderr)
+    return results
+
+def import_time(module):
+    """
+    (cumulative import time of module in ms, whether PyQt5 got imported),
+    measured in a fresh interpreter with -X importtime.
+    """
+    code = f"import sys, {module}; print('PyQt5' in sys.modules)"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=HERE,
+                          capture_output=True, text=True, check=True)
+    # Lines read "import time: self [us] | cumulative | imported package"
+    for line in proc.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000, proc.stdout.strip() == "True"
+    raise RuntimeError(f"no import time reported for {module}")
+
+def check_startup(runs=STARTUP_RUNS):
+    results = {}
+    failures = []
+    for module, (budget, qt_allowed) in STARTUP_BUDGETS.items():
+        times = []
+        for _ in range(runs):
+            ms, qt = import_time(module)
+            times.append(ms)
+        ms = round(min(times), 1)
+        results[module] = {"import_ms": ms, "budget_ms": budget, "imports_qt": qt}
+        print(f"{module:14s} {ms:>7.1f} ms  budget {budget} ms  {'Qt' if qt else 'no Qt'}",
+              file=sys.stderr)
+        if ms > budget:
+            failures.append(f"{module}: imports in {ms} ms, budget {budget} ms")
+        if qt and not qt_allowed:
+            failures.append(f"{module}: imports PyQt5")
+    return results, failures
+
+def leaks(results):
+    return [f"{name}: memory grows {result['growth_kib']} KiB per window after warm-up"
+            for name, result in results.items() if result["growth_kib"] > GROWTH_SLACK_KIB]
+
+def regressions(results, baseline, threshold):
+    failures = []
+    for name, result in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if result["ticks_per_sec"] < base["ticks_per_sec"] * (1 - threshold):
+            failures.append(f"{name}: {result['ticks_per_sec']} ticks/s vs {base['ticks_per_sec']}")
+        if (result["render_ms"] is not None and base.get("render_ms") is not None
+                and result["render_ms"] > base["render_ms"] * (1 + threshold)):
+            failures.append(f"{name}: {result['render_ms']} ms/frame vs {base['render_ms']}")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turret Defense benchmarks")
+    parser.add_argument("scenarios", nargs="*", metavar="SCENARIO",
+                        help=f"scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--ticks", type=int, default=3000, help="simulation ticks per scenario")
+    parser.add_argument("--frames", type=int, default=200,
+                        help="rendered frames per scenario (0 skips rendering)")
+    parser.add_argument("--output", metavar="FILE", help="write JSON results here")
+    parser.add_argument("--baseline", metavar="FILE", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed slowdown against the baseline (fraction)")
+    parser.add_argument("--startup", action="store_true",
+                        help="check module import times against STARTUP_BUDGETS instead")
+    args = parser.parse_args(argv)
+    if args.startup:
+        results, failures = check_startup()
+        print(json.dumps({"python": sys.version.split()[0], "startup": results}, indent=2))
+        for failure in failures:
+            print("OVER BUDGET " + failure, file=sys.stderr)
+        return 1 if failures else 0
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    results = run(args.scenarios or list(SCENARIOS), args.ticks, args.frames)
+    report = {"python": sys.version.split()[0], "ticks": args.ticks,
+              "frames": args.frames, "scenarios": results}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    failures = leaks(results)
+    for failure in failures:
+        print("LEAK " + failure, file=sys.stderr)
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = regressions(results, json.load(f), args.threshold)
+        for failure in slower:
+            print("REGRESSION " + failure, file=sys.stderr)
+        failures += slower
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lead-targeting autopilot.
+
+The solver works on whole batches of enemies at once: given the turret
+position and parallel sequences of enemy positions and velocities it
+returns, per enemy, the time at which a bullet fired now would meet it
+and the time at which the enemy would reach the turret. Autopilot uses
+both to pick a target every tick, most urgent threat first.
+
+Two ways to drive a game:
+
+    bot = Autopilot()
+    engine.step(bot.control(engine))   # As a player would; replayable
+    bot.drive(engine)                  # Aims and calls fire_bullet() directly
+
+Usage: python turret_bot.py [--seed N] [--max-time S] [--games N] [--event-log FILE]
+(headless soak run)
+"""
+
+import sys
+import math
+import time
+import argparse
+
+from turret_events import EventLog
+from turret_sim import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BULLET_SPEED, BULLET_RADIUS, ENEMY_RADIUS, TURRET_HEIGHT,
+    BARREL_LENGTH, MAX_BULLETS, GAME_MODES, GameEngine, TickInput
+)
+
+INF = float("inf")
+HIT_REACH = BULLET_RADIUS + ENEMY_RADIUS
+IMPACT_REACH = ENEMY_RADIUS + TURRET_HEIGHT / 2  # Same reach GameEngine uses for damage
+CLAIM_MARGIN = 0.1  # Extra seconds an enemy stays claimed by a shot in flight
+
+def intercept_times(ox, oy, xs, ys, vxs, vys, speed=BULLET_SPEED, muzzle=BARREL_LENGTH):
+    """
+    Time until a bullet fired now from (ox, oy) meets each target, or INF.
+
+    The bullet leaves the barrel tip, muzzle px out, so it travels
+    muzzle + speed * t from the turret centre; the target is at
+    p + v * t. Squaring |p + v t| = muzzle + speed t gives
+    a t^2 + b t + c = 0 with the coefficients below, solved for the
+    smallest positive root.
+    """
+    ss = speed * speed
+    sm = speed * muzzle
+    mm = muzzle * muzzle
+    sqrt = math.sqrt
+    result = []
+    append = result.append
+    for x, y, vx, vy in zip(xs, ys, vxs, vys):
+        dx = x - ox
+        dy = y - oy
+        a = vx * vx + vy * vy - ss
+        half_b = dx * vx + dy * vy - sm
+        c = dx * dx + dy * dy - mm
+        if c <= 0:
+            append(0.0)  # Already inside the muzzle radius
+            continue
+        if a == 0:
+            append(-c / (2 * half_b) if half_b < 0 else INF)
+            continue
+        disc = half_b * half_b - a * c
+        if disc < 0:
+            append(INF)
+            continue
+        root = sqrt(disc)
+        t1 = (-half_b - root) / a
+        t2 = (-half_b + root) / a
+        if t1 > t2:
+            t1, t2 = t2, t1
+        append(t1 if t1 > 0 else t2 if t2 > 0 else INF)
+    return result
+
+def impact_times(ox, oy, xs, ys, vxs, vys, reach=IMPACT_REACH):
+    """Time until each target comes within reach of (ox, oy), or INF if it never does."""
+    rr = reach * reach
+    sqrt = math.sqrt
+    result = []
+    append = result.append
+    for x, y, vx, vy in zip(xs, ys, vxs, vys):
+        dx = x - ox
+        dy = y - oy
+        c = dx * dx + dy * dy - rr
+        if c <= 0:
+            append(0.0)
+            continue
+        a = vx * vx + vy * vy
+        half_b = dx * vx + dy * vy
+        if a == 0 or half_b >= 0:
+            append(INF)  # Standing still or moving away
+            continue
+        disc = half_b * half_b - a * c
+        append((-half_b - sqrt(disc)) / a if disc >= 0 else INF)
+    return result
+
+def angle_difference(a, b):
+    """Smallest absolute difference between two angles in degrees."""
+    d = (a - b) % 360
+    return 360 - d if d > 180 else d
+
+class Autopilot:
+    """
+    Picks one enemy per tick: the one that will reach the turret soonest
+    among those a bullet can still stop in time, else the quickest one to
+    hit. Enemies with a shot already on the way are skipped until that
+    shot should have landed.
+    """
+    def __init__(self, speed=BULLET_SPEED):
+        self.speed = speed
+        self.engine = None
+        self.claims = {}  # Enemy key -> sim time the shot lands
+
+    def reset(self, engine=None):
+        self.engine = engine
+        self.claims = {}
+
+    def choose(self, engine):
+        """(enemy key, aim_x, aim_y, intercept time) for the best target, or None."""
+        if engine is not self.engine:
+            self.reset(engine)
+        enemies = engine.enemies
+        n = enemies.count
+        if not n:
+            return None
+        turret = engine.turret
+        ox = turret.x
+        oy = turret.y
+        xs = enemies.x[:n]
+        ys = enemies.y[:n]
+        vxs = enemies.vx[:n]
+        vys = enemies.vy[:n]
+        keys = enemies.key
+        hits = intercept_times(ox, oy, xs, ys, vxs, vys, self.speed)
+        impacts = impact_times(ox, oy, xs, ys, vxs, vys)
+
+        now = engine.scheduler.now
+        claims = self.claims
+        best = None
+        best_key = None
+        for i, t in enumerate(hits):
+            if t == INF or t > impacts[i]:
+                continue
+            aim_x = xs[i] + vxs[i] * t
+            aim_y = ys[i] + vys[i] * t
+            if not (0 <= aim_x <= SCREEN_WIDTH and 0 <= aim_y <= SCREEN_HEIGHT):
+                continue  # The bullet would leave the screen first
+            claim = claims.get(keys[i])
+            if claim is not None and claim > now:
+                continue
+            key = (impacts[i], t)
+            if best_key is None or key < best_key:
+                best_key = key
+                best = (keys[i], aim_x, aim_y, t)
+        if len(claims) > n:
+            self.claims = {k: v for k, v in claims.items() if v > now}
+        return best
+
+    def claim(self, engine, enemy, t):
+        self.claims[enemy] = engine.scheduler.now + t + CLAIM_MARGIN
+
+    def control(self, engine):
+        """
+        TickInput that aims at the chosen target's intercept point. Clicks
+        fire with the previous tick's aim, so the bot only clicks once the
+        barrel is already within hitting distance of the target.
+        """
+        turret = engine.turret
+        target = self.choose(engine)
+        if target is None:
+            return TickInput(turret.target_x, turret.target_y, space_held=True)
+        enemy, aim_x, aim_y, t = target
+        wanted = math.degrees(math.atan2(aim_y - turret.y, aim_x - turret.x))
+        tolerance = math.degrees(HIT_REACH / (BARREL_LENGTH + self.speed * t)) / 2
+        clicks = 0
+        if angle_difference(turret.angle, wanted) <= tolerance and len(engine.bullets) < MAX_BULLETS:
+            clicks = 1
+            self.claim(engine, enemy, t)
+        return TickInput(aim_x, aim_y, clicks=clicks, space_held=True)
+
+    def drive(self, engine):
+        """Aim at the chosen target, fire through fire_bullet() and step once."""
+        turret = engine.turret
+        target = self.choose(engine)
+        if target is None:
+            return engine.step(TickInput(turret.target_x, turret.target_y, space_held=True))
+        enemy, aim_x, aim_y, t = target
+        if not engine.game_over and not engine.pause and len(engine.bullets) < MAX_BULLETS:
+            turret.update(aim_x, aim_y)
+            engine.fire_bullet()
+            self.claim(engine, enemy, t)
+        return engine.step(TickInput(aim_x, aim_y, space_held=True))
+
+def play(engine, bot, max_ticks, event_log=None):
+    """Play engine until game over or max_ticks; returns seconds spent in the bot."""
+    bot_time = 0.0
+    while engine.tick < max_ticks and not engine.game_over:
+        t = time.perf_counter()
+        inputs = bot.control(engine)
+        bot_time += time.perf_counter() - t
+        events = engine.step(inputs)
+        if event_log is not None:
+            event_log.record(engine.tick, events)
+    return bot_time
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turret Defense autopilot soak run")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-time", type=float, default=600, help="simulated seconds")
+    parser.add_argument("--mode", default="Classic", choices=GAME_MODES)
+    parser.add_argument("--games", type=int, default=1, help="games to play, seeds counting up")
+    parser.add_argument("--event-log", metavar="FILE", help="append gameplay events to FILE")
+    args = parser.parse_args(argv)
+
+    event_log = EventLog(args.event_log) if args.event_log else None
+    for game in range(args.games):
+        seed = None if args.seed is None else args.seed + game
+        engine = GameEngine(game_mode=args.mode, seed=seed)
+        if event_log is not None:
+            event_log.start_session(engine.seed, engine.tick_rate, engine.game_mode)
+        bot = Autopilot()
+        max_ticks = int(args.max_time * engine.tick_rate)
+        start = time.perf_counter()
+        bot_time = play(engine, bot, max_ticks, event_log)
+        elapsed = time.perf_counter() - start
+        print(f"mode={engine.game_mode} seed={engine.seed} ticks={engine.tick} "
+              f"score={engine.score} level={engine.level} health={engine.health} "
+              f"game_over={engine.game_over} "
+              f"(bot {bot_time / max(engine.tick, 1) * 1e6:.1f} us/tick, "
+              f"{engine.tick / max(elapsed, 1e-9):.0f} ticks/s)")
+    if event_log is not None:
+        event_log.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Particle effects for kills, turret damage and power-up pickups.
+
+ParticleSystem keeps every particle in preallocated parallel arrays used
+as a ring buffer: spawning writes the next slot (overwriting the oldest
+particle once all are taken), so no particle object is ever allocated.
+update() moves all live particles in one pass over the arrays, and the
+live particles always sit in the `count` slots before `head`.
+
+Each particle has a sprite index into SPRITES; the view renders one
+cached sprite per entry and fades particles out by their remaining life.
+Effects are purely visual: they use their own RNG and never touch the
+simulation.
+"""
+
+import math
+import random
+import itertools
+from array import array
+
+from turret_sim import ENEMY_RADIUS, HIT_FLASH_TIME, WHITE
+
+PARTICLE_CAPACITY = 1024
+DRAG = 0.05  # Fraction of its speed a particle keeps after one second
+
+# Sprite index -> (radius, rgb)
+FLASH = 0
+DEBRIS_NORMAL = 1
+DEBRIS_FAST = 2
+SPARK = 3
+SPARKLE_HEALTH = 4
+SPARKLE_RAPID_FIRE = 5
+SPRITES = (
+    (ENEMY_RADIUS, WHITE),
+    (3, (255, 60, 60)),
+    (3, (255, 230, 0)),
+    (2, (255, 150, 40)),
+    (3, (0, 255, 100)),
+    (3, (0, 200, 255)),
+)
+DEBRIS = {'normal': DEBRIS_NORMAL, 'fast': DEBRIS_FAST}
+SPARKLE = {'health': SPARKLE_HEALTH, 'rapid_fire': SPARKLE_RAPID_FIRE}
+
+class ParticleSystem:
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        zeros = [0.0] * capacity
+        self.x = array('d', zeros)
+        self.y = array('d', zeros)
+        self.vx = array('d', zeros)
+        self.vy = array('d', zeros)
+        self.life = array('d', zeros)
+        self.max_life = array('d', [1.0] * capacity)
+        self.sprite = array('B', bytes(capacity))
+        self.head = 0   # Slot the next particle goes into
+        self.count = 0  # Slots before head that may still be alive
+        self.bounds = None  # (left, top, right, bottom) of the live particles after update()
+        self.rng = random.Random(seed)
+
+    def clear(self):
+        self.count = 0
+        self.bounds = None
+
+    def spawn(self, x, y, vx, vy, life, sprite):
+        i = self.head
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.life[i] = life
+        self.max_life[i] = life
+        self.sprite[i] = sprite
+        self.head = i + 1 if i + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+
+    def burst(self, x, y, sprite, n, speed_min, speed_max, life):
+        """n particles flying out of (x, y) in random directions."""
+        rng = self.rng
+        for _ in range(n):
+            angle = rng.uniform(0.0, 2 * math.pi)
+            speed = rng.uniform(speed_min, speed_max)
+            self.spawn(x, y, speed * math.cos(angle), speed * math.sin(angle),
+                       life * rng.uniform(0.7, 1.0), sprite)
+
+    def effect(self, event, value):
+        """Spawn the effect for one engine event; value is (type, x, y)."""
+        kind, x, y = value
+        if event == "kill":
+            self.spawn(x, y, 0.0, 0.0, HIT_FLASH_TIME, FLASH)
+            self.burst(x, y, DEBRIS[kind], 8, 60.0, 200.0, 0.4)
+        elif event == "damage":
+            self.burst(x, y, SPARK, 10, 100.0, 260.0, 0.3)
+        elif event == "pickup":
+            self.burst(x, y, SPARKLE[kind], 12, 40.0, 120.0, 0.5)
+
+    def slots(self):
+        """Indices of the slots that may hold live particles, oldest first."""
+        start = self.head - self.count
+        if start >= 0:
+            return range(start, self.head)
+        return itertools.chain(range(start + self.capacity, self.capacity), range(self.head))
+
+    def update(self, dt):
+        """Age and move every live particle by dt seconds, then drop the dead ones at the tail."""
+        if not self.count:
+            self.bounds = None
+            return
+        xs = self.x
+        ys = self.y
+        vxs = self.vx
+        vys = self.vy
+        lives = self.life
+        damp = DRAG ** dt
+        left = top = math.inf
+        right = bottom = -math.inf
+        for i in self.slots():
+            life = lives[i] - dt
+            lives[i] = life
+            if life <= 0:
+                continue
+            vx = vxs[i] * damp
+            vy = vys[i] * damp
+            vxs[i] = vx
+            vys[i] = vy
+            x = xs[i] = xs[i] + vx * dt
+            y = ys[i] = ys[i] + vy * dt
+            if x < left:
+                left = x
+            if x > right:
+                right = x
+            if y < top:
+                top = y
+            if y > bottom:
+                bottom = y
+        # Particles die roughly in spawn order, so trimming the tail keeps
+        # the next pass close to the number actually alive
+        capacity = self.capacity
+        count = self.count
+        tail = self.head - count
+        while count and lives[tail] <= 0:
+            count -= 1
+            tail = tail + 1 if tail + 1 < capacity else 0
+        self.count = count
+        self.bounds = (left, top, right, bottom) if right >= left else None
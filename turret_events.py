@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gameplay event log and offline analytics.
+
+EventLog appends the gameplay events of every step() to a compact
+binary file that can hold any number of sessions:
+
+    header  b"TEVT", version (u8), written once when the file is created
+    record  code (u8), zigzag varint tick delta against the previous
+            record (rewinds and quick loads make it negative), then:
+            SESSION    varint seed, f64 tick rate, game mode (u8 length
+                       + utf-8); ticks restart from 0
+            KILL       u8 enemy type
+            DAMAGE     u8 type of the enemy that reached the turret
+            PICKUP     u8 power-up type
+            COMBO      varint combo count, 0 when the chain breaks
+            LEVEL      varint new level
+            GAME_OVER  varint final score
+            RESTORE    varint level, varint combo count of the state a
+                       rewind or quick load jumped to (version 2)
+
+Records are encoded into a buffer on the game's thread and handed in
+FLUSH_BYTES batches to a background thread that does the file writes,
+so the game never waits on the disk.
+
+The analytics side streams the records back with generators and keeps
+only running totals, so memory stays flat however long the logs are:
+
+    python turret_events.py sessions*.tevt [--json]
+"""
+
+import sys
+import json
+import queue
+import struct
+import argparse
+import threading
+
+from turret_sim import ENEMY_TYPES, POWERUP_TYPES
+from turret_replay import write_varint, zigzag, unzigzag
+
+MAGIC = b"TEVT"
+VERSION = 2  # 2: RESTORE records
+READ_VERSIONS = (1, 2)  # Version 1 logs are version 2 logs without RESTORE
+FLUSH_BYTES = 16384
+TICK_RATE = struct.Struct("<d")
+MAX_RECORD = 300  # Longest possible record (a SESSION with a 255 byte mode)
+
+SESSION = 0
+KILL = 1
+DAMAGE = 2
+PICKUP = 3
+COMBO = 4
+LEVEL = 5
+GAME_OVER = 6
+RESTORE = 7
+
+EVENT_CODES = {"kill": KILL, "damage": DAMAGE, "pickup": PICKUP, "combo": COMBO,
+               "level_up": LEVEL, "game_over": GAME_OVER}
+TYPE_CODES = {KILL: {t: i for i, t in enumerate(ENEMY_TYPES)},
+              DAMAGE: {t: i for i, t in enumerate(ENEMY_TYPES)},
+              PICKUP: {t: i for i, t in enumerate(POWERUP_TYPES)}}
+TIME_BUCKET = 15  # Seconds per time-to-death histogram bucket
+
+class EventLog:
+    """Append-only event log writer; see the module docstring for the format."""
+    def __init__(self, path, flush_bytes=FLUSH_BYTES):
+        self.file = open(path, "ab")
+        self.buffer = bytearray()
+        if self.file.tell() == 0:
+            self.buffer += MAGIC
+            self.buffer.append(VERSION)
+        else:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC) + 1) != MAGIC + bytes((VERSION,)):
+                    self.file.close()
+                    raise ValueError(f"{path} is not a version {VERSION} event log")
+        self.flush_bytes = flush_bytes
+        self.last_tick = 0
+        self.score = 0
+        self.batches = queue.SimpleQueue()
+        self.writer = threading.Thread(target=self.write_batches, name="event-log", daemon=True)
+        self.writer.start()
+
+    def start_session(self, seed, tick_rate, game_mode):
+        out = self.buffer
+        out.append(SESSION)
+        write_varint(out, 0)
+        write_varint(out, seed)
+        out += TICK_RATE.pack(tick_rate)
+        mode = game_mode.encode("utf-8")[:255]
+        out.append(len(mode))
+        out += mode
+        self.last_tick = 0
+        self.score = 0
+
+    def record(self, tick, events):
+        """Log the events one step() returned; events that are not gameplay facts are skipped."""
+        out = self.buffer
+        for event, value in events:
+            if event == "score":
+                self.score = value  # Kept for GAME_OVER, kills already imply it
+                continue
+            code = EVENT_CODES.get(event)
+            if code is None:
+                continue
+            out.append(code)
+            write_varint(out, zigzag(tick - self.last_tick))
+            self.last_tick = tick
+            if code <= PICKUP:
+                out.append(TYPE_CODES[code][value[0]])  # (type, x, y)
+            elif code == GAME_OVER:
+                write_varint(out, self.score)
+            else:
+                write_varint(out, value)
+        if len(out) >= self.flush_bytes:
+            self.flush()
+
+    def restore(self, tick, level, combo, score):
+        """Log that the game jumped back to a saved state at tick."""
+        out = self.buffer
+        out.append(RESTORE)
+        write_varint(out, zigzag(tick - self.last_tick))
+        write_varint(out, level)
+        write_varint(out, combo)
+        self.last_tick = tick
+        self.score = score
+
+    def flush(self):
+        if self.buffer:
+            self.batches.put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def write_batches(self):
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                return
+            self.file.write(batch)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.batches.put(None)
+        self.writer.join()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def varint_at(buf, pos):
+    """(value, next position) of the varint at buf[pos]."""
+    result = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+def read_events(path, chunk_size=65536):
+    """
+    Yield (code, tick, value) for every record in one log, SESSION values
+    being (seed, tick_rate, mode). The file is read chunk_size bytes at a
+    time, whatever its length.
+    """
+    with open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 1)
+        if len(header) <= len(MAGIC) or header[:-1] != MAGIC or header[-1] not in READ_VERSIONS:
+            raise ValueError(f"{path} is not an event log of a supported version")
+        buf = b""
+        pos = 0
+        eof = False
+        tick = 0
+        while True:
+            if not eof and len(buf) - pos < MAX_RECORD:
+                chunk = f.read(chunk_size)
+                eof = len(chunk) < chunk_size
+                buf = buf[pos:] + chunk
+                pos = 0
+            if pos == len(buf):
+                return
+            try:
+                code = buf[pos]
+                delta, pos = varint_at(buf, pos + 1)
+                delta = unzigzag(delta)
+                if code == SESSION:
+                    seed, pos = varint_at(buf, pos)
+                    (tick_rate,) = TICK_RATE.unpack_from(buf, pos)
+                    pos += TICK_RATE.size
+                    end = pos + 1 + buf[pos]
+                    if end > len(buf):
+                        raise IndexError
+                    value = (seed, tick_rate, buf[pos + 1:end].decode("utf-8"))
+                    pos = end
+                    tick = delta
+                elif code <= PICKUP:
+                    value = buf[pos]
+                    pos += 1
+                    tick += delta
+                elif code <= GAME_OVER:
+                    value, pos = varint_at(buf, pos)
+                    tick += delta
+                elif code == RESTORE:
+                    level, pos = varint_at(buf, pos)
+                    combo, pos = varint_at(buf, pos)
+                    value = (level, combo)
+                    tick += delta
+                else:
+                    raise ValueError(f"{path}: unknown event code {code}")
+            except (IndexError, struct.error):
+                raise EOFError(f"{path}: truncated event log") from None
+            yield code, tick, value
+
+class Analytics:
+    """Running totals over any number of sessions, fed one record at a time."""
+    def __init__(self):
+        self.sessions = 0
+        self.deaths = 0
+        self.kills = {}      # level -> [normal, fast]
+        self.damage = {}     # level -> hits taken
+        self.pickups = [0] * len(POWERUP_TYPES)
+        self.combos = {}     # chain length -> chains
+        self.death_times = {}  # TIME_BUCKET bucket -> deaths
+        self.death_time_total = 0.0
+        self.death_time_min = None
+        self.death_time_max = 0.0
+        self.scores = 0
+        self.level = None  # Until the first SESSION record
+        self.chain = 0
+
+    def feed(self, code, tick, value):
+        if code == SESSION:
+            self.end_chain()
+            self.sessions += 1
+            self.tick_rate = value[1]
+            self.level = 1
+            self.chain = 0
+        elif self.level is None:
+            raise ValueError("event before the first session record")
+        elif code == KILL:
+            kills = self.kills.get(self.level)
+            if kills is None:
+                kills = self.kills[self.level] = [0] * len(ENEMY_TYPES)
+            kills[value] += 1
+        elif code == DAMAGE:
+            self.damage[self.level] = self.damage.get(self.level, 0) + 1
+        elif code == PICKUP:
+            self.pickups[value] += 1
+        elif code == COMBO:
+            if value <= self.chain:
+                self.end_chain()  # Broken, or a new chain started the same step
+            self.chain = value
+        elif code == LEVEL:
+            self.level = value
+        elif code == RESTORE:
+            # Later records belong to the level and combo chain of the restored state
+            self.end_chain()
+            self.level, self.chain = value
+        elif code == GAME_OVER:
+            seconds = tick / self.tick_rate
+            self.deaths += 1
+            self.scores += value
+            bucket = int(seconds // TIME_BUCKET)
+            self.death_times[bucket] = self.death_times.get(bucket, 0) + 1
+            self.death_time_total += seconds
+            self.death_time_max = max(self.death_time_max, seconds)
+            if self.death_time_min is None or seconds < self.death_time_min:
+                self.death_time_min = seconds
+            self.end_chain()
+
+    def end_chain(self):
+        if self.chain:
+            self.combos[self.chain] = self.combos.get(self.chain, 0) + 1
+            self.chain = 0
+
+    def death_time_percentile(self, p):
+        """Upper edge of the histogram bucket holding the p-th fraction of deaths."""
+        if not self.deaths:
+            return None
+        target = p * self.deaths
+        seen = 0
+        for bucket in sorted(self.death_times):
+            seen += self.death_times[bucket]
+            if seen >= target:
+                return (bucket + 1) * TIME_BUCKET
+        return None
+
+    def report(self):
+        self.end_chain()
+        deaths = self.deaths
+        return {
+            "sessions": self.sessions,
+            "deaths": deaths,
+            "mean_score": round(self.scores / deaths, 1) if deaths else None,
+            "kills_per_level": {level: dict(zip(ENEMY_TYPES, kills))
+                                for level, kills in sorted(self.kills.items())},
+            "damage_per_level": dict(sorted(self.damage.items())),
+            "pickups": dict(zip(POWERUP_TYPES, self.pickups)),
+            "combo_lengths": dict(sorted(self.combos.items())),
+            "time_to_death": {
+                "mean": round(self.death_time_total / deaths, 2) if deaths else None,
+                "min": round(self.death_time_min, 2) if deaths else None,
+                "max": round(self.death_time_max, 2),
+                "p50_at_most": self.death_time_percentile(0.5),
+                "p90_at_most": self.death_time_percentile(0.9),
+                "histogram": {f"{b * TIME_BUCKET}-{(b + 1) * TIME_BUCKET}s": n
+                              for b, n in sorted(self.death_times.items())},
+            },
+        }
+
+def analyze(paths):
+    analytics = Analytics()
+    feed = analytics.feed
+    for path in paths:
+        for code, tick, value in read_events(path):
+            feed(code, tick, value)
+    return analytics.report()
+
+def print_report(report):
+    print(f"sessions {report['sessions']}, deaths {report['deaths']}, "
+          f"mean score {report['mean_score']}")
+    print("kills per level:")
+    for level, kills in report["kills_per_level"].items():
+        damage = report["damage_per_level"].get(level, 0)
+        print(f"  {level:>3}: " + " ".join(f"{t} {n}" for t, n in kills.items())
+              + f"  damage taken {damage}")
+    print("pickups: " + " ".join(f"{t} {n}" for t, n in report["pickups"].items()))
+    print("combo length distribution:")
+    total = sum(report["combo_lengths"].values()) or 1
+    for length, n in report["combo_lengths"].items():
+        print(f"  x{length:<3} {n:>8}  {100 * n / total:5.1f}%")
+    ttd = report["time_to_death"]
+    if report["deaths"]:
+        print(f"time to death: mean {ttd['mean']}s min {ttd['min']}s max {ttd['max']}s "
+              f"p50 <= {ttd['p50_at_most']}s p90 <= {ttd['p90_at_most']}s")
+    else:
+        print("time to death: no game overs logged")
+    for label, n in ttd["histogram"].items():
+        print(f"  {label:>10} {n}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turret Defense event log analytics")
+    parser.add_argument("logs", nargs="+", metavar="LOG", help="event log files")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    try:
+        report = analyze(args.logs)
+    except (OSError, ValueError, EOFError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Turret Defense entry point:
+
+    python turret_game.py [--sim-rate N] [--quality TIER] [--serve ADDRESS] ...
+
+This module does not import Qt. The arguments are parsed first, so
+--help and argument errors return at once; PyQt5 and the start screen
+(turret_ui) load next, and the game view only once a mode is picked.
+turret_bench.py --startup checks the import times against a budget.
+"""
+
+import sys
+import argparse
+
+from turret_sim import DEFAULT_TICK_RATE, tick_rate_arg
+from turret_quality import TIERS
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Turret Defense")
+    parser.add_argument("--sim-rate", type=tick_rate_arg, default=DEFAULT_TICK_RATE,
+                        help="simulation steps per second (e.g. 30 on weak hardware)")
+    parser.add_argument("--record", metavar="FILE",
+                        help="record the current game's input to a replay file")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="play back a replay file in real time")
+    parser.add_argument("--profile-log", metavar="FILE",
+                        help="stream per-frame phase timings to FILE (.csv or .jsonl)")
+    parser.add_argument("--event-log", metavar="FILE",
+                        help="append gameplay events to FILE (see turret_events.py)")
+    parser.add_argument("--quality", default="auto",
+                        choices=["auto"] + [tier.name for tier in TIERS],
+                        help="render quality tier (default: adapt to frame times)")
+    parser.add_argument("--serve", metavar="ADDRESS",
+                        help="stream the game to spectators on HOST:PORT or unix:PATH")
+    parser.add_argument("--spectate", metavar="ADDRESS",
+                        help="watch a game served with --serve instead of playing")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, qt_args = parser.parse_known_args(argv)
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1] + qt_args)
+    if args.spectate:
+        from turret_view import SpectatorWidget
+        try:
+            view = SpectatorWidget(args.spectate, quality=args.quality)
+        except ValueError as e:
+            parser.error(str(e))
+        view.setWindowTitle(f"Turret Defense - watching {args.spectate}")
+        view.show()
+        return app.exec_()
+    tick_rate = args.sim_rate
+    if args.replay:
+        # A replay plays at its recorded rate, whatever --sim-rate says
+        from turret_replay import ReplayReader
+        try:
+            reader = ReplayReader(args.replay)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read replay {args.replay}: {e}")
+        tick_rate = reader.tick_rate
+        reader.file.close()
+    event_log = None
+    if args.event_log:
+        from turret_events import EventLog
+        try:
+            event_log = EventLog(args.event_log)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot open event log {args.event_log}: {e}")
+    spectators = None
+    if args.serve:
+        from turret_spectate import SpectatorServer
+        try:
+            spectators = SpectatorServer(args.serve, tick_rate)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot serve spectators on {args.serve}: {e}")
+    from turret_ui import MainWindow
+    window = MainWindow(tick_rate=args.sim_rate, record_path=args.record,
+                        replay_path=args.replay, profile_log=args.profile_log,
+                        quality=args.quality, spectators=spectators,
+                        event_log=event_log)
+    if args.replay:
+        window.start_game(None)  # Mode comes from the replay header
+    window.show()
+    return app.exec_()
+
+if __name__ == '__main__':
+    sys.exit(main())
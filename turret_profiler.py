@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-phase frame profiler.
+
+GameEngine.step() times its phases on a StepTimer owned by the
+simulation thread, and the step's times travel to the GUI thread on the
+Frame they produced. There FrameProfiler merges them with the paint
+time of that frame, keeps a rolling window of those samples for the
+in-game overlay and can stream every sample to a CSV or JSONL file
+through a background writer thread. The two threads never share a
+timer.
+"""
+
+import json
+import queue
+import threading
+from collections import deque
+from time import perf_counter
+
+PHASES = ("input", "turret", "update", "collision", "compaction", "paint")
+PHASE_INPUT, PHASE_TURRET, PHASE_UPDATE, PHASE_COLLISION, PHASE_COMPACTION, PHASE_PAINT = range(len(PHASES))
+COUNTS = ("enemies", "bullets", "powerups")
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+class SampleWriter:
+    """
+    Buffered background writer for profiler samples. The game thread only
+    puts rows on a queue; a daemon thread formats and writes them in batches.
+    """
+    BATCH = 256
+
+    def __init__(self, path):
+        self.path = path
+        self.jsonl = path.endswith(".jsonl")
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name="profile-writer", daemon=True)
+        self.thread.start()
+
+    def write(self, row):
+        self.queue.put(row)
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self):
+        fields = ("frame", "frame_ms") + PHASES + COUNTS
+        with open(self.path, "w") as f:
+            if not self.jsonl:
+                f.write(",".join(fields) + "\n")
+            done = False
+            while not done:
+                rows = [self.queue.get()]
+                while len(rows) < self.BATCH:
+                    try:
+                        rows.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                lines = []
+                for row in rows:
+                    if row is None:
+                        done = True
+                        break
+                    if self.jsonl:
+                        lines.append(json.dumps(dict(zip(fields, row))))
+                    else:
+                        lines.append(",".join(str(v) for v in row))
+                if lines:
+                    f.write("\n".join(lines) + "\n")
+
+class StepTimer:
+    """
+    Phase timings of one simulation step (begin/lap), in milliseconds.
+    take() returns them and starts the next step from zero.
+    """
+    def __init__(self):
+        self.current = [0.0] * len(PHASES)
+        self.t = perf_counter()
+
+    def begin(self):
+        self.t = perf_counter()
+
+    def lap(self, phase):
+        now = perf_counter()
+        self.current[phase] += (now - self.t) * 1000
+        self.t = now
+
+    def take(self):
+        phases = tuple(self.current)
+        self.current = [0.0] * len(PHASES)
+        return phases
+
+class FrameProfiler:
+    """
+    Collects phase timings for the frame in progress (merge/add) and
+    closes it with end_frame(). Times are kept in milliseconds.
+    """
+    def __init__(self, window=240, sink=None):
+        self.samples = deque(maxlen=window)
+        self.current = [0.0] * len(PHASES)
+        self.sink = sink
+        self.frame = 0
+        self.last_frame = perf_counter()
+
+    def merge(self, phases):
+        """Add a StepTimer.take() result to the frame in progress."""
+        current = self.current
+        for i, ms in enumerate(phases):
+            current[i] += ms
+
+    def add(self, phase, seconds):
+        self.current[phase] += seconds * 1000
+
+    def end_frame(self, counts=(0, 0, 0)):
+        now = perf_counter()
+        frame_ms = (now - self.last_frame) * 1000
+        self.last_frame = now
+        phases = tuple(round(v, 4) for v in self.current)
+        self.samples.append((frame_ms, phases, tuple(counts)))
+        if self.sink is not None:
+            self.sink.write((self.frame, round(frame_ms, 4)) + phases + tuple(counts))
+        self.frame += 1
+        self.current = [0.0] * len(PHASES)
+
+    def percentiles(self, fractions=(0.5, 0.95, 0.99)):
+        """{phase: [p50, p95, p99]} over the window, plus "frame"."""
+        result = {"frame": [percentile(sorted(s[0] for s in self.samples), f) for f in fractions]}
+        for i, name in enumerate(PHASES):
+            values = sorted(s[1][i] for s in self.samples)
+            result[name] = [percentile(values, f) for f in fractions]
+        return result
+
+    def histogram(self, bins=16, max_ms=33.3):
+        counts = [0] * bins
+        width = max_ms / bins
+        for frame_ms, _, _ in self.samples:
+            counts[min(int(frame_ms / width), bins - 1)] += 1
+        return counts
+
+    def latest_counts(self):
+        return self.samples[-1][2] if self.samples else (0, 0, 0)
+
+    def close(self):
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
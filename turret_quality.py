@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Adaptive render quality.
+
+QualityGovernor watches how long each paint takes and walks through
+TIERS, cheapest last: it drops a tier as soon as the 90th percentile of
+a full window of paints misses the budget, and only climbs back after
+paints have stayed well inside the budget for a long stretch, so it does
+not flap between two tiers. Every change is kept in `changes` and passed
+to the listeners for telemetry.
+"""
+
+import time
+from collections import deque
+
+from turret_profiler import percentile
+
+RENDER_BUDGET_MS = 8.0  # Paint time that still leaves room in a 120 Hz frame
+WINDOW = 60             # Paints measured before judging a tier
+HEADROOM = 0.6          # Climb back only below this fraction of the budget...
+UPGRADE_AFTER = 240     # ...held for this many paints in a row
+
+class QualityTier:
+    __slots__ = ('name', 'antialias', 'simple_powerups', 'hud_every', 'max_bullets',
+                 'max_particles')
+
+    def __init__(self, name, antialias=True, simple_powerups=False, hud_every=1, max_bullets=None,
+                 max_particles=None):
+        self.name = name
+        self.antialias = antialias
+        self.simple_powerups = simple_powerups
+        self.hud_every = hud_every      # Redraw HUD text at most every n paints
+        self.max_bullets = max_bullets  # None draws them all
+        self.max_particles = max_particles
+
+    def describe(self):
+        effects = []
+        if not self.antialias:
+            effects.append("antialiasing off")
+        if self.simple_powerups:
+            effects.append("plain power-up icons")
+        if self.hud_every > 1:
+            effects.append(f"HUD text every {self.hud_every} paints")
+        if self.max_bullets is not None:
+            effects.append(f"at most {self.max_bullets} bullets drawn")
+        if self.max_particles is not None:
+            effects.append(f"at most {self.max_particles} particles drawn")
+        return ", ".join(effects) or "full quality"
+
+TIERS = (
+    QualityTier("full"),
+    QualityTier("no_aa", antialias=False),
+    QualityTier("simple", antialias=False, simple_powerups=True),
+    QualityTier("hud_skip", antialias=False, simple_powerups=True, hud_every=3),
+    QualityTier("minimal", antialias=False, simple_powerups=True, hud_every=3, max_bullets=48,
+                max_particles=256),
+)
+
+class QualityChange:
+    __slots__ = ('paint', 'time', 'old', 'new', 'p90_ms', 'reason')
+
+    def __init__(self, paint, old, new, p90_ms, reason):
+        self.paint = paint
+        self.time = time.time()
+        self.old = old
+        self.new = new
+        self.p90_ms = p90_ms
+        self.reason = reason
+
+    def as_dict(self):
+        return {"paint": self.paint, "time": self.time, "old": self.old.name,
+                "new": self.new.name, "p90_ms": round(self.p90_ms, 3),
+                "reason": self.reason, "effect": self.new.describe()}
+
+class QualityGovernor:
+    def __init__(self, budget_ms=RENDER_BUDGET_MS, tiers=TIERS, window=WINDOW,
+                 headroom=HEADROOM, upgrade_after=UPGRADE_AFTER):
+        self.budget_ms = budget_ms
+        self.tiers = tiers
+        self.headroom = headroom
+        self.upgrade_after = upgrade_after
+        self.level = 0
+        self.enabled = True
+        self.samples = deque(maxlen=window)
+        self.calm = 0
+        self.paints = 0
+        self.changes = deque(maxlen=64)
+        self.listeners = []
+
+    @property
+    def tier(self):
+        return self.tiers[self.level]
+
+    def record(self, paint_ms):
+        """Feed one paint time; returns the QualityChange it caused, if any."""
+        self.paints += 1
+        if not self.enabled:
+            return None
+        samples = self.samples
+        samples.append(paint_ms)
+        if paint_ms < self.budget_ms * self.headroom:
+            self.calm += 1
+        else:
+            self.calm = 0
+        if len(samples) < samples.maxlen:
+            return None
+        p90 = percentile(sorted(samples), 0.9)
+        if p90 > self.budget_ms and self.level < len(self.tiers) - 1:
+            return self.set_level(self.level + 1, p90, "over budget")
+        if self.calm >= self.upgrade_after and self.level > 0:
+            return self.set_level(self.level - 1, p90, "headroom")
+        return None
+
+    def set_level(self, level, p90_ms=0.0, reason="manual"):
+        change = QualityChange(self.paints, self.tier, self.tiers[level], p90_ms, reason)
+        self.level = level
+        # Judge the new tier on its own paints only
+        self.samples.clear()
+        self.calm = 0
+        self.changes.append(change)
+        for listener in self.listeners:
+            listener(change)
+        return change
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deterministic session recording and playback.
+
+A replay is the engine seed plus one TickInput per step(), written as a
+small header followed by delta-encoded records:
+
+    header  b"TRPL", version (u8), tick_rate (f64), seed (u64),
+            game mode (u8 length + utf-8)
+    record  flags (u8) followed by the fields named in flags:
+            MOUSE   zigzag varint dx, dy against the previous tick
+            KEYS    u8: arrow bitmask | space held << 4 | pause << 5
+            CLICKS  varint
+            SPACE   varint space presses
+    idle    IDLE flag alone + varint n: n ticks with unchanged state and
+            no clicks or presses
+
+Mouse positions are stored as integers, which is what Qt reports.
+
+Usage: python turret_replay.py FILE   (plays FILE headless, full speed)
+"""
+
+import sys
+import math
+import struct
+import time
+
+from turret_sim import GAME_MODES, GameEngine, TickInput
+
+MAGIC = b"TRPL"
+VERSION = 2  # 2: enemies come from seeded wave schedules
+HEADER = struct.Struct("<BdQ")
+
+MOUSE = 0x01
+KEYS = 0x02
+CLICKS = 0x04
+SPACE = 0x08
+IDLE = 0x80
+
+FLUSH_BYTES = 4096
+
+def write_varint(out, value):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(stream):
+    result = shift = 0
+    for byte in stream:
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result
+        shift += 7
+    raise EOFError("truncated replay")
+
+def zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+def unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+def pack_keys(inputs):
+    return inputs.keys | (inputs.space_held << 4) | (inputs.pause << 5)
+
+class ReplayWriter:
+    def __init__(self, path, seed, tick_rate, game_mode="Classic"):
+        self.file = open(path, "wb")
+        mode = game_mode.encode("utf-8")
+        self.buffer = bytearray(MAGIC)
+        self.buffer += HEADER.pack(VERSION, tick_rate, seed)
+        self.buffer.append(len(mode))
+        self.buffer += mode
+        self.mouse_x = 0
+        self.mouse_y = 0
+        self.keys = 0
+        self.idle = 0
+        self.ticks = 0
+
+    def record(self, inputs):
+        mouse_x = int(inputs.mouse_x)
+        mouse_y = int(inputs.mouse_y)
+        keys = pack_keys(inputs)
+        flags = 0
+        if mouse_x != self.mouse_x or mouse_y != self.mouse_y:
+            flags |= MOUSE
+        if keys != self.keys:
+            flags |= KEYS
+        if inputs.clicks:
+            flags |= CLICKS
+        if inputs.space_presses:
+            flags |= SPACE
+        self.ticks += 1
+        if not flags:
+            self.idle += 1
+            return
+        self.flush_idle()
+        out = self.buffer
+        out.append(flags)
+        if flags & MOUSE:
+            write_varint(out, zigzag(mouse_x - self.mouse_x))
+            write_varint(out, zigzag(mouse_y - self.mouse_y))
+            self.mouse_x = mouse_x
+            self.mouse_y = mouse_y
+        if flags & KEYS:
+            out.append(keys)
+            self.keys = keys
+        if flags & CLICKS:
+            write_varint(out, inputs.clicks)
+        if flags & SPACE:
+            write_varint(out, inputs.space_presses)
+        if len(out) >= FLUSH_BYTES:
+            self.flush()
+
+    def flush_idle(self):
+        if self.idle:
+            self.buffer.append(IDLE)
+            write_varint(self.buffer, self.idle)
+            self.idle = 0
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush_idle()
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_bytes(f, chunk_size=65536):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield from chunk
+
+class ReplayReader:
+    """Streams TickInputs back out of a replay file, one per step()."""
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.read_header(path)
+        except ValueError:
+            self.file.close()
+            raise
+        self.stream = read_bytes(self.file)
+
+    def read_header(self, path):
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        header = self.file.read(HEADER.size + 1)
+        if len(header) < HEADER.size + 1:
+            raise ValueError(f"{path} is truncated")
+        version, self.tick_rate, self.seed = HEADER.unpack_from(header)
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+        if not 0 < self.tick_rate < math.inf:
+            raise ValueError(f"{path} has a bad tick rate {self.tick_rate}")
+        size = header[-1]
+        self.game_mode = self.file.read(size).decode("utf-8")
+        if self.game_mode not in GAME_MODES:
+            raise ValueError(f"{path} has an unknown game mode {self.game_mode!r}")
+
+    def __iter__(self):
+        stream = self.stream
+        mouse_x = mouse_y = keys = 0
+        for flags in stream:
+            if flags == IDLE:
+                for _ in range(read_varint(stream)):
+                    yield TickInput(mouse_x, mouse_y, keys & 0x0f, 0, 0,
+                                    bool(keys & 0x10), bool(keys & 0x20))
+                continue
+            clicks = space_presses = 0
+            if flags & MOUSE:
+                mouse_x += unzigzag(read_varint(stream))
+                mouse_y += unzigzag(read_varint(stream))
+            if flags & KEYS:
+                keys = next(stream)
+            if flags & CLICKS:
+                clicks = read_varint(stream)
+            if flags & SPACE:
+                space_presses = read_varint(stream)
+            yield TickInput(mouse_x, mouse_y, keys & 0x0f, clicks, space_presses,
+                            bool(keys & 0x10), bool(keys & 0x20))
+        self.file.close()
+
+    def engine(self, **kwargs):
+        return GameEngine(game_mode=self.game_mode, tick_rate=self.tick_rate,
+                          seed=self.seed, **kwargs)
+
+def play(path):
+    """Run a replay headless as fast as possible, return the final engine."""
+    reader = ReplayReader(path)
+    engine = reader.engine()
+    for inputs in reader:
+        engine.step(inputs)
+    return engine
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit("usage: turret_replay.py FILE")
+    start = time.perf_counter()
+    engine = play(sys.argv[1])
+    elapsed = time.perf_counter() - start
+    print(f"mode={engine.game_mode} seed={engine.seed} ticks={engine.tick} "
+          f"score={engine.score} level={engine.level} health={engine.health} "
+          f"game_over={engine.game_over} ({engine.tick / max(elapsed, 1e-9):.0f} ticks/s)")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent per-mode leaderboard.
+
+Scores live in an SQLite database in WAL mode, so a crash mid-write can
+never corrupt earlier results. The top entries per game mode are read
+once when the store is opened and then served from memory; new results
+update that cache at once and are written by a background thread, so a
+game over never waits for the disk.
+"""
+
+import os
+import time
+import queue
+import sqlite3
+import threading
+
+SCORES_FILE = "scores.db"
+LEGACY_HIGHSCORE_FILE = "highscore.txt"  # Single Classic score, pre-leaderboard
+TOP_N = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    mode TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_mode ON scores (mode, score DESC);
+"""
+
+class ScoreEntry:
+    __slots__ = ('mode', 'score', 'level', 'duration', 'played_at')
+
+    def __init__(self, mode, score, level, duration, played_at):
+        self.mode = mode
+        self.score = score
+        self.level = level
+        self.duration = duration
+        self.played_at = played_at
+
+    def row(self):
+        return (self.mode, self.score, self.level, self.duration, self.played_at)
+
+def connect(path):
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+class ScoreStore:
+    def __init__(self, path=SCORES_FILE, top_n=TOP_N):
+        self.path = path
+        self.top_n = top_n
+        self.cache = {}
+        db = connect(path)
+        try:
+            self.migrate_legacy(db)
+            rows = db.execute(
+                "SELECT mode, score, level, duration, played_at FROM ("
+                " SELECT *, ROW_NUMBER() OVER (PARTITION BY mode ORDER BY score DESC) AS rank"
+                " FROM scores) WHERE rank <= ? ORDER BY mode, score DESC", (top_n,)).fetchall()
+        finally:
+            db.close()
+        for row in rows:
+            self.cache.setdefault(row[0], []).append(ScoreEntry(*row))
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name="score-writer", daemon=True)
+        self.thread.start()
+
+    def migrate_legacy(self, db):
+        legacy = os.path.join(os.path.dirname(os.path.abspath(self.path)), LEGACY_HIGHSCORE_FILE)
+        if not os.path.exists(legacy):
+            return
+        if db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]:
+            return
+        try:
+            with open(legacy) as f:
+                score = int(f.read())
+        except (OSError, ValueError):
+            return
+        with db:
+            db.execute("INSERT INTO scores VALUES (?, ?, ?, ?, ?)",
+                       ("Classic", score, 1, 0.0, os.path.getmtime(legacy)))
+
+    def top(self, mode):
+        return list(self.cache.get(mode, ()))
+
+    def best(self, mode):
+        entries = self.cache.get(mode)
+        return entries[0].score if entries else 0
+
+    def submit(self, mode, score, level, duration):
+        """Record a finished game; returns its leaderboard rank or None."""
+        entry = ScoreEntry(mode, score, level, duration, time.time())
+        self.queue.put(entry)
+        entries = self.cache.setdefault(mode, [])
+        rank = 0
+        while rank < len(entries) and entries[rank].score >= score:
+            rank += 1
+        if rank >= self.top_n:
+            return None
+        entries.insert(rank, entry)
+        del entries[self.top_n:]
+        return rank + 1
+
+    def run(self):
+        db = connect(self.path)
+        done = False
+        while not done:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                done = True
+            rows = [entry.row() for entry in batch if entry is not None]
+            if rows:
+                with db:
+                    db.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?)", rows)
+        db.close()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
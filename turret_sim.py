@@ -0,0 +1,964 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Headless simulation core for the Turret Minigame.
+
+Nothing in here imports Qt, so the game can be stepped without a
+QApplication (batch runs, benchmarks, server-side validation).
+
+@author: Keruki2004
+"""
+
+import random
+import math
+import heapq
+import json
+import argparse
+from array import array
+
+from turret_profiler import (
+    PHASE_INPUT, PHASE_TURRET, PHASE_UPDATE, PHASE_COLLISION, PHASE_COMPACTION
+)
+
+# --- Game Constants ---
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+TURRET_WIDTH = 40
+TURRET_HEIGHT = 20
+BULLET_RADIUS = 5
+ENEMY_RADIUS = 15
+# Speeds are in px per second, durations and spawn rates in seconds
+ENEMY_SPEED = 125
+FAST_ENEMY_SPEED = 250
+ENEMY_LEVEL_SPEEDUP = 15.625  # Extra speed per level, up to 10 levels
+BULLET_SPEED = 500
+INITIAL_ENEMY_SPAWN_RATE = 0.9  # Modified for level system
+MAX_ENEMIES = 100
+MAX_BULLETS = 128
+SCORE_INCREMENT = 10
+FAST_ENEMY_SCORE = 25
+STARTING_HEALTH = 30
+MAX_HEALTH = 50
+POWERUP_RADIUS = 14
+POWERUP_SPAWN_RATE = 8.0
+POWERUP_DURATION = 3.5
+POWERUP_LIFETIME = 12.0  # Seconds an uncollected power-up stays on the field
+MAX_POWERUPS = 4        # No new power-ups spawn while this many are waiting
+RAPID_FIRE_INTERVAL = 0.048
+COMBO_RESET_TIME = 1.2
+HIT_FLASH_TIME = 0.08  # How long a destroyed enemy flashes (drawn by turret_effects)
+HUD_MESSAGE_TIME = 1.1
+LEVEL_MESSAGE_TIME = 1.3
+
+TURRET_MOVE_SPEED = 375
+BARREL_LENGTH = 30
+
+LEVEL_UP_SCORE = 150      # Points needed to next level
+ENEMY_SPAWN_ACCEL = 0.08    # How much faster enemies spawn each level (s)
+ENEMY_MIN_SPAWN_RATE = 0.3  # Minimum allowed enemy spawn interval (s)
+FAST_ENEMY_SHARE = 0.3      # Fraction of spawns that are fast enemies
+MAX_LEVEL = 20
+WAVE_LENGTH = 512       # Spawns per wave schedule; a longer level repeats it
+WAVE_CACHE_SIZE = 64    # Wave schedules kept by wave_schedule()
+
+DEFAULT_TICK_RATE = 60  # Simulation steps per second
+GRID_CELL_SIZE = ENEMY_RADIUS + BULLET_RADIUS  # Broad phase cell edge (px)
+BROAD_PHASE_MIN_BULLETS = 8  # Below this, testing every bullet beats grid lookups
+
+# GameEngine.snapshot() layout
+SNAPSHOT_VERSION = 6
+ENGINE_STATE = ('seed', 'score', 'health', 'game_over', 'pause', 'rapid_fire',
+                'rapid_fire_space_held', 'combo_count', 'hud_message', 'hud_message_color',
+                'level', 'level_target_score', 'wave_index', 'tick')
+# Scheduler jobs held by the engine: attribute -> method the job calls
+ENGINE_JOBS = (('enemy_spawn_job', 'spawn_next_enemy'), ('powerup_spawn_job', 'spawn_powerup'),
+               ('combo_job', 'end_combo'), ('rapid_fire_job', 'end_rapid_fire'),
+               ('rapid_fire_shot_job', 'rapid_fire_shot'), ('hud_message_job', 'clear_hud_message'),
+               ('powerup_expiry_job', 'expire_powerups'))
+TURRET_STATE = ('x', 'y', 'angle', 'target_x', 'target_y')
+
+# Arrow key bitmask used by TickInput.keys
+KEY_LEFT = 1
+KEY_RIGHT = 2
+KEY_UP = 4
+KEY_DOWN = 8
+
+ENEMY_TYPES = ('normal', 'fast')  # WaveSchedule.kinds indexes this
+POWERUP_TYPES = ('health', 'rapid_fire')
+# Event logs and the spectator stream send indexes into both tables, so
+# new types go at the end
+
+# Tuning overrides per game mode; Classic is the Tuning defaults
+GAME_MODES = {
+    "Classic": {},
+    "Hardcore": {"enemy_spawn_rate": 0.75, "spawn_accel": 0.1, "min_spawn_rate": 0.22,
+                 "enemy_level_speedup": 20.0, "powerup_spawn_rate": 12.0,
+                 "fast_enemy_share": 0.45, "spawn_jitter": 0.5, "starting_health": 15},
+    "Practice": {"enemy_spawn_rate": 1.2, "spawn_accel": 0.05, "min_spawn_rate": 0.5,
+                 "enemy_level_speedup": 10.0, "powerup_spawn_rate": 6.0,
+                 "fast_enemy_share": 0.15, "starting_health": MAX_HEALTH, "enemy_damage": 0},
+}
+
+# Colors are plain RGB tuples here, the view turns them into QColors
+WHITE = (255, 255, 255)
+CYAN = (0, 255, 255)
+BULLET_COLORS = (WHITE, CYAN)  # A bullet's EntityStore kind indexes this
+
+def tick_rate_arg(text):
+    """argparse type for --tick-rate/--sim-rate: a finite rate above zero."""
+    try:
+        rate = float(text)
+    except ValueError:
+        rate = math.nan
+    if not 0 < rate < math.inf:
+        raise argparse.ArgumentTypeError(f"expected a rate above zero, got {text!r}")
+    return rate
+
+def is_collision_sq(x1, y1, x2, y2, r):
+    dx = x2 - x1
+    dy = y2 - y1
+    return dx * dx + dy * dy < r * r
+
+def swept_hit_time(x1, y1, vx1, vy1, x2, y2, vx2, vy2, r, dt):
+    """
+    Continuous version of is_collision_sq for two points that just moved
+    for dt seconds at constant velocity and ended at (x1, y1), (x2, y2).
+    Returns the time into the step, 0..dt, at which they first came
+    within r of each other, or None if they never did.
+    """
+    rvx = vx1 - vx2
+    rvy = vy1 - vy2
+    # Offset at the start of the step
+    dx = x1 - x2 - rvx * dt
+    dy = y1 - y2 - rvy * dt
+    c = dx * dx + dy * dy - r * r
+    if c < 0:
+        return 0.0
+    a = rvx * rvx + rvy * rvy
+    half_b = dx * rvx + dy * rvy
+    if a == 0 or half_b >= 0:
+        return None  # Not closing in
+    disc = half_b * half_b - a * c
+    if disc < 0:
+        return None
+    t = (-half_b - math.sqrt(disc)) / a
+    return t if t <= dt else None
+
+class SpatialHash:
+    """
+    Uniform grid broad phase. Cells hold list or store indices, so query()
+    hands back candidates in index order and callers keep first-hit-wins
+    rules.
+    """
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def build(self, entities):
+        cells = self.cells
+        cells.clear()
+        cs = self.cell_size
+        for i, e in enumerate(entities):
+            if not e.active:
+                continue
+            key = (int(e.x // cs), int(e.y // cs))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [i]
+            else:
+                bucket.append(i)
+
+    def build_swept(self, store, dt):
+        """
+        Like build(), but for an EntityStore: each entity goes into every
+        cell its path over the last dt seconds touched, for swept
+        collision queries.
+        """
+        cells = self.cells
+        cells.clear()
+        cs = self.cell_size
+        for i, x, y, vx, vy, active in zip(range(store.count), store.x, store.y,
+                                           store.vx, store.vy, store.active):
+            if not active:
+                continue
+            x0 = int(x // cs)
+            y0 = int(y // cs)
+            x1 = int((x - vx * dt) // cs)
+            y1 = int((y - vy * dt) // cs)
+            if x0 == x1 and y0 == y1:
+                # Most steps stay inside one cell
+                bucket = cells.get((x0, y0))
+                if bucket is None:
+                    cells[(x0, y0)] = [i]
+                else:
+                    bucket.append(i)
+                continue
+            if x0 > x1:
+                x0, x1 = x1, x0
+            if y0 > y1:
+                y0, y1 = y1, y0
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [i]
+                    else:
+                        bucket.append(i)
+
+    def query(self, x, y, radius):
+        return self.query_box(x - radius, y - radius, x + radius, y + radius)
+
+    def query_box(self, left, top, right, bottom):
+        cells = self.cells
+        if not cells:
+            return []
+        cs = self.cell_size
+        x0 = int(left // cs)
+        x1 = int(right // cs)
+        y0 = int(top // cs)
+        y1 = int(bottom // cs)
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        if len(found) > 1:
+            # Swept entries can sit in several cells
+            found = sorted(set(found))
+        return found
+
+class EntityStore:
+    """
+    Structure-of-arrays storage for bullets or enemies: slot i of every
+    column describes one entity and the live ones are packed into the
+    first `count` slots, so no object is allocated per entity. kind
+    indexes the owner's table (BULLET_COLORS, ENEMY_TYPES) and key is a
+    serial number that tells entities apart from one frame to the next.
+
+    Positions and velocities are plain lists rather than array('d'):
+    reading an array boxes a new float every time, which made the hit
+    tests slower than they were with entity objects.
+
+    advance(), cull() and compact() each update the whole store in one
+    pass per tick. Entities marked inactive keep their slot, and so their
+    index, until compact() swap-removes them.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        zeros = [0.0] * capacity
+        self.x = list(zeros)
+        self.y = list(zeros)
+        self.vx = list(zeros)
+        self.vy = list(zeros)
+        self.kind = bytearray(capacity)
+        self.key = [0] * capacity
+        self.active = bytearray(capacity)
+        self.columns = (self.x, self.y, self.vx, self.vy, self.kind, self.key)
+        self.count = 0
+        self.next_key = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def add(self, x, y, vx, vy, kind=0):
+        """Store a new entity and return its slot, or -1 when the store is full."""
+        i = self.count
+        if i >= self.capacity:
+            return -1
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.kind[i] = kind
+        self.key[i] = self.next_key
+        self.active[i] = 1
+        self.next_key += 1
+        self.count = i + 1
+        return i
+
+    def advance(self, dt):
+        """Move every entity by dt seconds."""
+        n = self.count
+        if not n:
+            return
+        vxs = self.vx[:n]
+        if any(vxs):
+            self.x[:n] = [x + v * dt for x, v in zip(self.x, vxs)]
+        vys = self.vy[:n]
+        if any(vys):  # Enemies only move sideways
+            self.y[:n] = [y + v * dt for y, v in zip(self.y, vys)]
+
+    def cull(self, left, top, right, bottom):
+        """Mark every entity outside the given bounds inactive."""
+        n = self.count
+        if not n:
+            return
+        xs = self.x[:n]
+        ys = self.y[:n]
+        if min(xs) >= left and max(xs) <= right and min(ys) >= top and max(ys) <= bottom:
+            return  # The usual case: nothing left the screen this tick
+        self.active[:n] = bytes([a and left <= x <= right and top <= y <= bottom
+                                 for a, x, y in zip(self.active[:n], xs, ys)])
+
+    def compact(self):
+        """Drop inactive entities by moving the last live one into each hole."""
+        n = self.count
+        active = self.active
+        hole = active.find(0, 0, n)
+        while hole >= 0:
+            n -= 1
+            while n > hole and not active[n]:
+                n -= 1
+            if n == hole:
+                break
+            for column in self.columns:
+                column[hole] = column[n]
+            active[hole] = 1
+            hole = active.find(0, hole + 1, n)
+        self.count = n
+
+    def rows(self):
+        """[x, y, vx, vy, kind] of every entity, for snapshots."""
+        n = self.count
+        return [list(row) for row in zip(self.x[:n], self.y[:n], self.vx[:n], self.vy[:n],
+                                         self.kind[:n])]
+
+    def load(self, rows):
+        self.clear()
+        for row in rows:
+            self.add(*row)
+
+def compact(entities):
+    """Drop inactive entities in place, keeping order and the list object."""
+    write = 0
+    for e in entities:
+        if e.active:
+            entities[write] = e
+            write += 1
+    del entities[write:]
+    return entities
+
+class PowerUp:
+    __slots__ = ('type', 'x', 'y', 'active', 'color', 'expires')
+
+    def __init__(self, rng=random, expires=math.inf):
+        self.type = rng.choice(POWERUP_TYPES)
+        self.x = rng.randint(POWERUP_RADIUS, SCREEN_WIDTH-POWERUP_RADIUS)
+        self.y = rng.randint(POWERUP_RADIUS+40, SCREEN_HEIGHT-POWERUP_RADIUS-40)
+        self.active = True
+        self.color = (0,200,255) if self.type == 'rapid_fire' else (0,255,100)
+        self.expires = expires  # Sim time it disappears if not picked up
+
+class Turret:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.angle = 360
+        self.target_x = x
+        self.target_y = y
+        self.aim_angle = None
+        self.aim_direction = (1.0, 0.0)
+
+    def update(self, mouse_x, mouse_y):
+        self.target_x = mouse_x
+        self.target_y = mouse_y
+        dx = self.target_x - self.x
+        dy = self.target_y - self.y
+        self.angle = math.degrees(math.atan2(dy, dx))
+
+    def aim_vector(self):
+        """(cos, sin) of the barrel angle, recomputed only when it changes."""
+        if self.aim_angle != self.angle:
+            angle_rad = math.radians(self.angle)
+            self.aim_direction = (math.cos(angle_rad), math.sin(angle_rad))
+            self.aim_angle = self.angle
+        return self.aim_direction
+
+    def set_position(self, x, y):
+        self.x = x
+        self.y = y
+
+class Job:
+    __slots__ = ('when', 'last', 'interval', 'callback', 'cancelled')
+
+    def __init__(self, when, last, interval, callback):
+        self.when = when
+        self.last = last
+        self.interval = interval
+        self.callback = callback
+        self.cancelled = False
+
+class Scheduler:
+    """
+    Simulation-time job queue (a min-heap on due time). It only advances
+    when the engine steps, so pausing freezes every spawn in phase, and
+    jobs due on the same instant run in the order they were scheduled.
+
+    Countdowns are jobs too: a job made with new_job() sits idle until
+    start() sets it to run delay seconds from now, and starting it again
+    before then just moves the deadline. Nothing is done per tick for a
+    job that is not due.
+    """
+    EPSILON = 1e-9  # Absorbs float error from summing dt
+
+    def __init__(self):
+        self.now = 0.0
+        self.queue = []
+        self.seq = 0
+
+    def push(self, job):
+        self.seq += 1
+        heapq.heappush(self.queue, (job.when, self.seq, job))
+
+    def call_at(self, when, callback, interval=None):
+        job = Job(when, self.now, interval, callback)
+        self.push(job)
+        return job
+
+    def call_every(self, interval, callback):
+        return self.call_at(self.now + interval, callback, interval)
+
+    def new_job(self, callback, interval=None):
+        """A job that is not scheduled yet, see start()."""
+        job = Job(self.now, self.now, interval, callback)
+        job.cancelled = True
+        return job
+
+    def start(self, job, delay):
+        """(Re)schedule job to run delay seconds from now, then every interval if it has one."""
+        when = self.now + delay
+        if when == job.when and not job.cancelled:
+            return  # Already queued for that instant
+        job.when = when
+        job.cancelled = False
+        self.push(job)
+
+    def cancel(self, job):
+        job.cancelled = True
+
+    def advance(self, dt):
+        self.now += dt
+        queue = self.queue
+        limit = self.now + self.EPSILON
+        while queue and queue[0][0] <= limit:
+            when, _, job = heapq.heappop(queue)
+            if job.cancelled or when != job.when:
+                continue  # Stale entry left behind by cancel/start
+            job.last = when
+            if job.interval:
+                job.when = when + job.interval
+                self.push(job)
+            else:
+                job.cancelled = True  # Done; a leftover duplicate entry must not rerun it
+            job.callback()
+
+class Tuning:
+    """Difficulty knobs for one game. The defaults are the Classic values."""
+    FIELDS = ('enemy_spawn_rate', 'spawn_accel', 'min_spawn_rate', 'level_up_score',
+              'enemy_level_speedup', 'powerup_spawn_rate', 'fast_enemy_share', 'spawn_jitter',
+              'starting_health', 'enemy_damage')
+
+    def __init__(self, enemy_spawn_rate=INITIAL_ENEMY_SPAWN_RATE, spawn_accel=ENEMY_SPAWN_ACCEL,
+                 min_spawn_rate=ENEMY_MIN_SPAWN_RATE, level_up_score=LEVEL_UP_SCORE,
+                 enemy_level_speedup=ENEMY_LEVEL_SPEEDUP, powerup_spawn_rate=POWERUP_SPAWN_RATE,
+                 fast_enemy_share=FAST_ENEMY_SHARE, spawn_jitter=0.0,
+                 starting_health=STARTING_HEALTH, enemy_damage=1):
+        self.enemy_spawn_rate = enemy_spawn_rate
+        self.spawn_accel = spawn_accel
+        self.min_spawn_rate = min_spawn_rate
+        self.level_up_score = level_up_score
+        self.enemy_level_speedup = enemy_level_speedup
+        self.powerup_spawn_rate = powerup_spawn_rate
+        self.fast_enemy_share = fast_enemy_share
+        self.spawn_jitter = spawn_jitter  # Spawn gaps vary by up to this fraction of the rate
+        self.starting_health = starting_health
+        self.enemy_damage = enemy_damage  # Health lost per enemy reaching the turret
+
+    @classmethod
+    def for_mode(cls, game_mode, **overrides):
+        """The tuning of a GAME_MODES entry, with any fields overridden."""
+        if game_mode not in GAME_MODES:
+            raise ValueError(f"unknown game mode {game_mode!r}, expected one of {', '.join(GAME_MODES)}")
+        return cls(**{**GAME_MODES[game_mode], **overrides})
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def spawn_rate(self, level):
+        return max(self.enemy_spawn_rate - self.spawn_accel * (level-1), self.min_spawn_rate)
+
+class WaveSchedule:
+    """
+    One level's enemy spawns, generated up front from a seed in a single
+    pass: gaps[i] is the time from spawn i-1 to spawn i, and kinds (index
+    into ENEMY_TYPES), ys and speeds (signed: positive enters from the
+    left) describe enemy i. The engine reads them by index and wraps
+    around at the end, so a wave never changes once built.
+    """
+    __slots__ = ('gaps', 'kinds', 'ys', 'speeds')
+
+    def __init__(self, seed, level, game_mode, tuning, length=WAVE_LENGTH):
+        # String seeds hash the same in every process, unlike tuples
+        rng = random.Random(f"{seed}/{game_mode}/{level}")
+        uniform = rng.random
+        lane = rng.randrange
+        boost = tuning.enemy_level_speedup * min(level - 1, 10)
+        base_speeds = (ENEMY_SPEED + boost, FAST_ENEMY_SPEED + boost)
+        fast_share = tuning.fast_enemy_share
+        rate = tuning.spawn_rate(level)
+        jitter = tuning.spawn_jitter
+        kinds = [uniform() < fast_share for _ in range(length)]
+        self.kinds = array('B', kinds)
+        self.speeds = array('d', [base_speeds[fast] if uniform() < 0.5 else -base_speeds[fast]
+                                  for fast in kinds])
+        self.ys = array('H', [lane(ENEMY_RADIUS, SCREEN_HEIGHT - ENEMY_RADIUS + 1)
+                              for _ in range(length)])
+        if jitter:
+            self.gaps = array('d', [rate * (1.0 + jitter * (2.0 * uniform() - 1.0))
+                                    for _ in range(length)])
+        else:
+            self.gaps = array('d', [rate]) * length
+
+    def __len__(self):
+        return len(self.gaps)
+
+_wave_cache = {}
+
+def wave_schedule(seed, level, game_mode, tuning):
+    """The WaveSchedule for (seed, level, game_mode), built once and then shared."""
+    key = (seed, level, game_mode, tuning.values())
+    wave = _wave_cache.get(key)
+    if wave is None:
+        if len(_wave_cache) >= WAVE_CACHE_SIZE:
+            del _wave_cache[next(iter(_wave_cache))]  # Oldest first
+        wave = _wave_cache[key] = WaveSchedule(seed, level, game_mode, tuning)
+    return wave
+
+class TickInput:
+    """Everything the player did since the previous step."""
+    def __init__(self, mouse_x=SCREEN_WIDTH // 2, mouse_y=SCREEN_HEIGHT // 2,
+                 keys=0, clicks=0, space_presses=0, space_held=False, pause=False):
+        self.mouse_x = mouse_x
+        self.mouse_y = mouse_y
+        self.keys = keys
+        self.clicks = clicks
+        self.space_presses = space_presses
+        self.space_held = space_held
+        self.pause = pause
+
+class GameEngine:
+    """
+    Owns the whole game state and advances it by 1 / tick_rate seconds
+    per step(). Every speed and timer is in seconds, so the tick rate only
+    changes simulation granularity, not game speed.
+
+    step() returns the list of (event, value) tuples that happened during
+    the tick, e.g. ("score", 120) or ("game_over", None), so a view can
+    forward them to its own signals. Gameplay facts are events too:
+    ("kill", (enemy type, x, y)), ("damage", (enemy type, x, y)) and
+    ("pickup", (power-up type, x, y)).
+
+    All randomness comes from the per-game seed, through self.rng and the
+    wave schedules derived from it, so a seed plus the stream of
+    TickInputs reproduces a session exactly. game_mode picks the Tuning
+    from GAME_MODES unless one is passed in.
+    """
+    def __init__(self, game_mode="Classic", highscore=0, tick_rate=DEFAULT_TICK_RATE, seed=None,
+                 tuning=None):
+        self.game_mode = game_mode
+        self.tuning = tuning if tuning is not None else Tuning.for_mode(game_mode)
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.highscore = highscore
+        self.pause = False
+        self.profiler = None  # Optional turret_profiler.StepTimer
+        self.bullets = EntityStore(MAX_BULLETS)
+        self.enemies = EntityStore(MAX_ENEMIES)
+        self.init_game(seed)
+
+    def init_game(self, seed=None, game_mode=None):
+        """Start a new game, switching to game_mode and its tuning when one is given."""
+        if game_mode is not None:
+            self.game_mode = game_mode
+            self.tuning = Tuning.for_mode(game_mode)
+        if seed is None:
+            seed = random.randrange(2**63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.turret = Turret(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50)
+        self.bullets.clear()
+        self.enemies.clear()
+        self.powerups = []
+        self.score = 0
+        self.health = self.tuning.starting_health
+        self.game_over = False
+        self.rapid_fire = False
+        self.rapid_fire_space_held = False
+        self.combo_count = 0
+        self.hud_message = ""
+        self.hud_message_color = WHITE
+        self.level = 1
+        self.level_target_score = self.tuning.level_up_score
+        self.wave = wave_schedule(seed, self.level, self.game_mode, self.tuning)
+        self.wave_index = 0
+        self.scheduler = Scheduler()
+        new_job = self.scheduler.new_job
+        self.enemy_spawn_job = new_job(self.spawn_next_enemy)
+        self.scheduler.start(self.enemy_spawn_job, self.wave.gaps[0])
+        self.powerup_spawn_job = self.scheduler.call_every(self.tuning.powerup_spawn_rate,
+                                                           self.spawn_powerup)
+        self.combo_job = new_job(self.end_combo)
+        self.rapid_fire_job = new_job(self.end_rapid_fire)
+        self.rapid_fire_shot_job = new_job(self.rapid_fire_shot, RAPID_FIRE_INTERVAL)
+        self.hud_message_job = new_job(self.clear_hud_message)
+        self.powerup_expiry_job = new_job(self.expire_powerups)
+        self.bullet_grid = SpatialHash()
+        self.powerup_grid = SpatialHash()
+        self.powerup_grid_dirty = False
+        self.tick = 0
+        self.events = []
+
+    def emit(self, event, value=None):
+        self.events.append((event, value))
+
+    def try_move_turret(self, keys):
+        dx = dy = 0
+        step = TURRET_MOVE_SPEED * self.dt
+        if keys & KEY_LEFT:
+            dx -= step
+        if keys & KEY_RIGHT:
+            dx += step
+        if keys & KEY_UP:
+            dy -= step
+        if keys & KEY_DOWN:
+            dy += step
+        new_x = min(max(self.turret.x + dx, TURRET_WIDTH//2), SCREEN_WIDTH-TURRET_WIDTH//2)
+        new_y = min(max(self.turret.y + dy, TURRET_HEIGHT//2), SCREEN_HEIGHT-TURRET_HEIGHT//2)
+        self.turret.set_position(new_x, new_y)
+
+    def fire_bullet(self):
+        dx, dy = self.turret.aim_vector()
+        # Ignored once MAX_BULLETS are in flight
+        self.bullets.add(self.turret.x + BARREL_LENGTH * dx, self.turret.y + BARREL_LENGTH * dy,
+                         BULLET_SPEED * dx, BULLET_SPEED * dy, 1 if self.rapid_fire else 0)
+
+    def spawn_enemy(self):
+        """Spawn the next enemy of the wave; its slot is used up even when the screen is full."""
+        wave = self.wave
+        i = self.wave_index
+        self.wave_index = i + 1 if i + 1 < len(wave) else 0
+        if not self.game_over and not self.pause:
+            # Enters from the side its speed points away from
+            speed = wave.speeds[i]
+            x = -ENEMY_RADIUS if speed > 0 else SCREEN_WIDTH + ENEMY_RADIUS
+            self.enemies.add(x, wave.ys[i], speed, 0.0, wave.kinds[i])
+
+    def spawn_next_enemy(self):
+        """Spawn the enemy that is due and schedule the next one, keeping the wave's phase."""
+        self.spawn_enemy()
+        job = self.enemy_spawn_job
+        gap = self.wave.gaps[self.wave_index]
+        self.scheduler.start(job, job.when + gap - self.scheduler.now)
+
+    def spawn_powerup(self):
+        if self.game_over or self.pause or len(self.powerups) >= MAX_POWERUPS:
+            return
+        now = self.scheduler.now
+        self.powerups.append(PowerUp(self.rng, now + POWERUP_LIFETIME))
+        self.powerup_grid_dirty = True
+        if len(self.powerups) == 1:
+            self.scheduler.start(self.powerup_expiry_job, POWERUP_LIFETIME)
+
+    def expire_powerups(self):
+        """
+        Remove power-ups whose lifetime is over. They all live equally long,
+        so self.powerups is in expiry order and only the oldest one needs a
+        pending job.
+        """
+        now = self.scheduler.now + Scheduler.EPSILON
+        for powerup in self.powerups:
+            if powerup.expires > now:
+                self.scheduler.start(self.powerup_expiry_job, powerup.expires - self.scheduler.now)
+                return
+            if powerup.active:
+                powerup.active = False
+                self.powerup_grid_dirty = True
+
+    def activate_powerup(self, powerup):
+        self.emit("pickup", (powerup.type, powerup.x, powerup.y))
+        if powerup.type == "health":
+            self.health = min(MAX_HEALTH, self.health + 10)
+            self.emit("health", self.health)
+            self.show_hud_message("HEALTH UP!", (0,255,128))
+        elif powerup.type == "rapid_fire":
+            self.start_rapid_fire()
+            self.show_hud_message("RAPID FIRE!", (0,200,255))
+        else:
+            self.show_hud_message("POWER UP!", WHITE)
+
+    def start_rapid_fire(self, duration=POWERUP_DURATION):
+        self.rapid_fire = True
+        self.scheduler.start(self.rapid_fire_job, duration)
+        self.scheduler.start(self.rapid_fire_shot_job, RAPID_FIRE_INTERVAL)
+
+    def rapid_fire_shot(self):
+        if self.rapid_fire_space_held:
+            self.fire_bullet()
+
+    def end_rapid_fire(self):
+        self.rapid_fire = False
+        self.rapid_fire_space_held = False
+        self.scheduler.cancel(self.rapid_fire_shot_job)
+
+    def end_combo(self):
+        self.combo_count = 0
+        self.emit("combo", self.combo_count)
+
+    def show_hud_message(self, text, color=WHITE, duration=HUD_MESSAGE_TIME):
+        self.hud_message = text
+        self.hud_message_color = color
+        self.scheduler.start(self.hud_message_job, duration)
+
+    def clear_hud_message(self):
+        self.hud_message = ""
+
+    def check_level_up(self):
+        if self.level < MAX_LEVEL and self.score >= self.level * self.tuning.level_up_score:
+            self.set_level(self.level + 1)
+
+    def set_level(self, level):
+        self.level = level
+        self.emit("level", self.level)
+        self.emit("level_up", self.level)
+        self.show_hud_message(f"Level {self.level}!", CYAN, LEVEL_MESSAGE_TIME)
+        # The spawn already due keeps its time, the ones after it follow the new wave
+        self.wave = wave_schedule(self.seed, self.level, self.game_mode, self.tuning)
+        self.wave_index = 0
+
+    def snapshot(self):
+        """
+        The whole game state, RNG included, as plain JSON-safe values.
+        restore() of a snapshot followed by the same inputs replays the
+        game exactly.
+        """
+        scheduler = self.scheduler
+        # A restarted job can have a duplicate entry; keep the one that runs first
+        seqs = {id(job): seq for when, seq, job in sorted(scheduler.queue, reverse=True)
+                if when == job.when}
+        jobs = []
+        for name, _ in ENGINE_JOBS:
+            job = getattr(self, name)
+            seq = None if job.cancelled else seqs.get(id(job))
+            jobs.append([job.when, job.last, job.interval, seq])
+        version, internal, gauss_next = self.rng.getstate()
+        return {
+            "version": SNAPSHOT_VERSION,
+            "game_mode": self.game_mode,
+            "tick_rate": self.tick_rate,
+            "tuning": self.tuning.as_dict(),
+            "state": [getattr(self, name) for name in ENGINE_STATE],
+            "rng": [version, list(internal), gauss_next],
+            "turret": [getattr(self.turret, name) for name in TURRET_STATE],
+            "bullets": self.bullets.rows(),
+            "enemies": self.enemies.rows(),
+            "powerups": [[getattr(p, name) for name in PowerUp.__slots__] for p in self.powerups],
+            "scheduler": [scheduler.now, scheduler.seq, jobs],
+        }
+
+    def restore(self, snapshot):
+        """Replace the current game with one saved by snapshot()."""
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version {snapshot.get('version')}")
+        self.game_mode = snapshot["game_mode"]
+        self.tick_rate = snapshot["tick_rate"]
+        self.dt = 1.0 / self.tick_rate
+        self.tuning = Tuning(**snapshot["tuning"])
+        for name, value in zip(ENGINE_STATE, snapshot["state"]):
+            setattr(self, name, value)
+        self.hud_message_color = tuple(self.hud_message_color)
+        self.wave = wave_schedule(self.seed, self.level, self.game_mode, self.tuning)
+        version, internal, gauss_next = snapshot["rng"]
+        self.rng.setstate((version, tuple(internal), gauss_next))
+
+        self.turret = Turret(0, 0)
+        for name, value in zip(TURRET_STATE, snapshot["turret"]):
+            setattr(self.turret, name, value)
+        self.bullets.load(snapshot["bullets"])
+        self.enemies.load(snapshot["enemies"])
+        self.powerups = []
+        for values in snapshot["powerups"]:
+            powerup = PowerUp.__new__(PowerUp)
+            for name, value in zip(PowerUp.__slots__, values):
+                setattr(powerup, name, value)
+            powerup.color = tuple(powerup.color)
+            self.powerups.append(powerup)
+
+        now, seq, jobs = snapshot["scheduler"]
+        self.scheduler = scheduler = Scheduler()
+        scheduler.now = now
+        scheduler.seq = seq
+        for (when, last, interval, job_seq), (name, method) in zip(jobs, ENGINE_JOBS):
+            job = Job(when, last, interval, getattr(self, method))
+            if job_seq is None:
+                job.cancelled = True
+            else:
+                heapq.heappush(scheduler.queue, (when, job_seq, job))
+            setattr(self, name, job)
+        self.powerup_grid_dirty = True
+        self.events = []
+
+    def step(self, inputs=None):
+        self.events = []
+        if inputs is None:
+            inputs = TickInput(self.turret.target_x, self.turret.target_y, pause=self.pause)
+        self.pause = inputs.pause
+        if self.game_over or self.pause:
+            return self.events
+        prof = self.profiler
+        if prof is not None:
+            prof.begin()
+
+        # Shots fired since the last tick use the previous aim
+        for _ in range(inputs.clicks):
+            self.fire_bullet()
+        for _ in range(inputs.space_presses):
+            if not self.rapid_fire:
+                self.fire_bullet()
+        self.rapid_fire_space_held = self.rapid_fire and inputs.space_held
+        if prof is not None:
+            prof.lap(PHASE_INPUT)
+
+        self.try_move_turret(inputs.keys)
+        self.turret.update(inputs.mouse_x, inputs.mouse_y)
+        if prof is not None:
+            prof.lap(PHASE_TURRET)
+
+        # Spawns and every countdown (combo, rapid fire, HUD message,
+        # power-up lifetimes) run from here, and only when they are due
+        self.scheduler.advance(self.dt)
+        self.tick += 1
+        dt = self.dt
+        bullets = self.bullets
+        enemies = self.enemies
+        # Bullets that left the screen stay active until after the hit
+        # tests, so they can still hit something they passed on the way
+        bullets.advance(dt)
+        enemies.advance(dt)
+        enemies.cull(-ENEMY_RADIUS, -math.inf, SCREEN_WIDTH + ENEMY_RADIUS, math.inf)
+        if prof is not None:
+            prof.lap(PHASE_UPDATE)
+
+        use_grid = bullets.count >= BROAD_PHASE_MIN_BULLETS
+        if use_grid:
+            self.bullet_grid.build_swept(bullets, self.dt)
+        query_bullets = self.bullet_grid.query_box
+        all_bullets = range(bullets.count)
+        bxs = bullets.x
+        bys = bullets.y
+        bvxs = bullets.vx
+        bvys = bullets.vy
+        bullet_active = bullets.active
+        exs = enemies.x
+        eys = enemies.y
+        evxs = enemies.vx
+        evys = enemies.vy
+        enemy_kinds = enemies.kind
+        enemy_active = enemies.active
+        bullet_step = BULLET_SPEED * dt
+        turret_x = self.turret.x
+        turret_y = self.turret.y
+        turret_reach = ENEMY_RADIUS + TURRET_HEIGHT / 2
+        hit_reach = BULLET_RADIUS + ENEMY_RADIUS
+        # Bullets are tested along their whole path this step, not just at
+        # the end, so low tick rates and fast bullets cannot tunnel through
+        # enemies; hits are then resolved in the order they happened
+        hits = []
+        for ei, ex, ey, evx, evy in zip(range(enemies.count), exs, eys, evxs, evys):
+            if is_collision_sq(ex, ey, turret_x, turret_y, turret_reach):
+                self.health -= self.tuning.enemy_damage
+                self.emit("damage", (ENEMY_TYPES[enemy_kinds[ei]], ex, ey))
+                self.emit("health", self.health)
+                enemy_active[ei] = 0
+                if self.health <= 0:
+                    self.game_over = True
+                    if self.score > self.highscore:
+                        self.highscore = self.score
+                        self.emit("highscore", self.highscore)
+                    self.emit("game_over")
+                continue
+            sx = abs(evx) * dt
+            sy = abs(evy) * dt
+            # No bullet closer than this at the end of the step can have hit
+            near_x = hit_reach + sx + bullet_step
+            near_y = hit_reach + sy + bullet_step
+            if use_grid:
+                candidates = query_bullets(ex - sx - hit_reach, ey - sy - hit_reach,
+                                           ex + sx + hit_reach, ey + sy + hit_reach)
+            else:
+                candidates = all_bullets
+            for bi in candidates:
+                bx = bxs[bi]
+                by = bys[bi]
+                dx = bx - ex
+                dy = by - ey
+                if dx > near_x or dx < -near_x or dy > near_y or dy < -near_y:
+                    continue
+                t = swept_hit_time(bx, by, bvxs[bi], bvys[bi], ex, ey, evx, evy, hit_reach, dt)
+                if t is not None:
+                    hits.append((t, ei, bi))
+        if len(hits) > 1:
+            hits.sort()
+        for t, ei, bi in hits:
+            if not (enemy_active[ei] and bullet_active[bi]):
+                continue  # One of them already hit something earlier in the step
+            bullet_active[bi] = 0
+            enemy_active[ei] = 0
+            # Where the enemy was at the moment of impact, t seconds into the step
+            back = dt - t
+            kind = ENEMY_TYPES[enemy_kinds[ei]]
+            self.emit("kill", (kind, exs[ei] - evxs[ei] * back, eys[ei] - evys[ei] * back))
+            self.score += FAST_ENEMY_SCORE if kind=="fast" else SCORE_INCREMENT
+            self.emit("score", self.score)
+            self.combo_count += 1
+            self.scheduler.start(self.combo_job, COMBO_RESET_TIME)
+            self.emit("combo", self.combo_count)
+        bullets.cull(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        if self.powerup_grid_dirty:
+            self.powerup_grid.build(self.powerups)
+            self.powerup_grid_dirty = False
+        pickup_reach = POWERUP_RADIUS + TURRET_HEIGHT
+        for i in self.powerup_grid.query(turret_x, turret_y, pickup_reach):
+            powerup = self.powerups[i]
+            if powerup.active and is_collision_sq(powerup.x, powerup.y, turret_x, turret_y, pickup_reach):
+                self.activate_powerup(powerup)
+                powerup.active = False
+                self.powerup_grid_dirty = True
+        if prof is not None:
+            prof.lap(PHASE_COLLISION)
+
+        bullets.compact()
+        enemies.compact()
+        powerup_count = len(self.powerups)
+        compact(self.powerups)
+        if len(self.powerups) != powerup_count:
+            self.powerup_grid_dirty = True  # The grid holds list indices
+        if prof is not None:
+            prof.lap(PHASE_COMPACTION)
+        self.check_level_up()
+        return self.events
+
+def save_snapshot(path, snapshot):
+    with open(path, "w") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+
+def load_snapshot(path):
+    with open(path) as f:
+        return json.load(f)
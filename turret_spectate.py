@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Spectator stream.
+
+A running game can publish its frames to any number of observers over a
+local TCP or Unix socket:
+
+    python turret_game.py --serve 127.0.0.1:5555
+    python turret_game.py --spectate 127.0.0.1:5555
+
+Every message is a header (body length, message type, tick) and a body.
+The stream opens with HELLO (protocol version, tick rate), and HELLO is
+sent again whenever the game's tick rate changes (a quick-load can
+restore a game saved at another rate). KEYFRAME
+carries the whole drawable state; DELTA carries only what changed since
+the previous tick: entities that appeared, vanished or changed, entities
+that only moved (as a byte-sized step) and the HUD and turret when they
+changed. Positions are quantized to 1/POSITION_SCALE px, speeds to whole
+px/s.
+
+The server runs an asyncio loop on its own thread and encodes each tick
+once for all observers. An observer whose socket buffer backs up past
+HIGH_WATER bytes is dropped to keyframes only, one every KEYFRAME_EVERY
+ticks, until its buffer drains below LOW_WATER; the keyframe it gets then
+resyncs it and deltas resume. The game never waits for an observer.
+
+    python turret_spectate.py --bench --observers 4   # Cost at MAX_ENEMIES
+"""
+
+import sys
+import time
+import struct
+import asyncio
+import argparse
+import threading
+
+from turret_sim import ENEMY_TYPES, POWERUP_TYPES, tick_rate_arg
+from turret_worker import Frame
+
+PROTOCOL_VERSION = 2
+HELLO = 0
+KEYFRAME = 1
+DELTA = 2
+
+POSITION_SCALE = 4     # Positions travel in quarter pixels
+ANGLE_SCALE = 100      # Turret angle in hundredths of a degree
+KEYFRAME_EVERY = 60    # Ticks between keyframes
+HIGH_WATER = 256 * 1024  # Buffered bytes that make an observer keyframe-only...
+LOW_WATER = 16 * 1024    # ...until its buffer drains below this
+
+HEADER = struct.Struct("<IBI")      # Body length, message type, tick
+HELLO_BODY = struct.Struct("<Bd")   # Protocol version, tick rate
+HUD = struct.Struct("<IIhHBBBBBB")  # Score, highscore, health, combo, level, flags, message rgb, message length
+TURRET = struct.Struct("<hhi")
+COUNT = struct.Struct("<H")
+WIRE_ID = struct.Struct("<H")
+MOVE = struct.Struct("<Hbb")        # Wire id, dx, dy
+BULLET = struct.Struct("<HhhhhBBB")  # Wire id, x, y, vx, vy, rgb
+ENEMY = struct.Struct("<HhhhhB")     # Wire id, x, y, vx, vy, kind
+POWERUP = struct.Struct("<HhhBBBB")  # Wire id, x, y, kind, rgb
+
+DELTA_HUD = 1
+DELTA_TURRET = 2
+FLAG_GAME_OVER = 1
+FLAG_PAUSE = 2
+
+ENEMY_CODES = {kind: i for i, kind in enumerate(ENEMY_TYPES)}
+POWERUP_CODES = {kind: i for i, kind in enumerate(POWERUP_TYPES)}
+INT16_MIN = -32768
+INT16_MAX = 32767
+
+def q16(value, scale=1):
+    v = int(round(value * scale))
+    return INT16_MIN if v < INT16_MIN else INT16_MAX if v > INT16_MAX else v
+
+def quantize(frame):
+    """Frame -> (hud, turret, bullets, enemies, powerups) in wire units, entities keyed by frame key."""
+    s = POSITION_SCALE
+    flags = (FLAG_GAME_OVER if frame.game_over else 0) | (FLAG_PAUSE if frame.pause else 0)
+    message = frame.hud_message.encode("utf-8")[:255]
+    hud = (frame.score, frame.highscore, frame.health, min(frame.combo, 0xFFFF),
+           min(frame.level, 0xFF), flags) + tuple(frame.hud_message_color) + (message,)
+    turret = (q16(frame.turret_x, s), q16(frame.turret_y, s),
+              int(round(frame.turret_angle * ANGLE_SCALE)))
+    # Entities never stray far off screen and speeds stay in the hundreds,
+    # so unlike the turret they need no clamping to fit an int16
+    bullets = {b[5]: (round(b[0] * s), round(b[1] * s), round(b[2]), round(b[3])) + b[4]
+               for b in frame.bullets}
+    kinds = ENEMY_CODES
+    enemies = {e[5]: (round(e[0] * s), round(e[1] * s), round(e[2]), round(e[3]), kinds[e[4]])
+               for e in frame.enemies}
+    kinds = POWERUP_CODES
+    powerups = {p[4]: (round(p[0] * s), round(p[1] * s), kinds[p[2]]) + p[3]
+                for p in frame.powerups}
+    return hud, turret, bullets, enemies, powerups
+
+def pack_hud(hud):
+    message = hud[-1]
+    return HUD.pack(*hud[:-1], len(message)) + message
+
+def message(kind, tick, body):
+    return HEADER.pack(len(body), kind, tick) + body
+
+class EntityTable:
+    """
+    Wire state of one entity kind: frame key -> small wire id, and the
+    record last sent for each wire id.
+    """
+    def __init__(self, record):
+        self.record = record
+        self.ids = {}
+        self.free = []
+        self.next_id = 0
+        self.sent = {}
+
+    def allocate(self):
+        if self.free:
+            return self.free.pop()
+        wid = self.next_id
+        if wid > 0xFFFF:
+            raise OverflowError("too many entities for the spectator stream")
+        self.next_id += 1
+        return wid
+
+    def update(self, records):
+        """Apply this tick's records; returns (removed ids, changed (id, record) pairs, moves)."""
+        ids = self.ids
+        sent = self.sent
+        removed = []
+        for key in [key for key in ids if key not in records]:
+            wid = ids.pop(key)
+            del sent[wid]
+            removed.append(wid)
+        # Freed only now, so a reused id is always announced as removed first
+        self.free.extend(removed)
+        changed = []
+        moves = []
+        for key, rec in records.items():
+            wid = ids.get(key)
+            if wid is None:
+                wid = ids[key] = self.allocate()
+                changed.append((wid, rec))
+            else:
+                old = sent[wid]
+                if rec == old:
+                    continue
+                dx = rec[0] - old[0]
+                dy = rec[1] - old[1]
+                if rec[2:] == old[2:] and -128 <= dx <= 127 and -128 <= dy <= 127:
+                    moves.append((wid, dx, dy))
+                else:
+                    changed.append((wid, rec))
+            sent[wid] = rec
+        return removed, changed, moves
+
+    def pack_all(self):
+        pack = self.record.pack
+        return COUNT.pack(len(self.sent)) + b"".join(pack(wid, *rec) for wid, rec in self.sent.items())
+
+class StreamEncoder:
+    """Turns the frames of one game into KEYFRAME and DELTA messages."""
+    def __init__(self, tick_rate):
+        self.tick_rate = tick_rate
+        self.tables = (EntityTable(BULLET), EntityTable(ENEMY), EntityTable(POWERUP))
+        self.hud = None
+        self.turret = None
+        self.tick = None
+        self.count = 0
+        self.cached_keyframe = None
+
+    def hello(self):
+        return message(HELLO, 0, HELLO_BODY.pack(PROTOCOL_VERSION, self.tick_rate))
+
+    def update(self, frame):
+        """Advance to frame and return the DELTA message that leads there."""
+        if frame.dt != 1.0 / self.tick_rate:
+            self.tick_rate = 1.0 / frame.dt
+        hud, turret, *entities = quantize(frame)
+        flags = 0
+        parts = [b""]
+        if hud != self.hud:
+            flags |= DELTA_HUD
+            parts.append(pack_hud(hud))
+            self.hud = hud
+        if turret != self.turret:
+            flags |= DELTA_TURRET
+            parts.append(TURRET.pack(*turret))
+            self.turret = turret
+        for table, records in zip(self.tables, entities):
+            removed, changed, moves = table.update(records)
+            pack = table.record.pack
+            parts.append(COUNT.pack(len(removed)))
+            parts.extend(WIRE_ID.pack(wid) for wid in removed)
+            parts.append(COUNT.pack(len(changed)))
+            parts.extend(pack(wid, *rec) for wid, rec in changed)
+            parts.append(COUNT.pack(len(moves)))
+            parts.extend(MOVE.pack(*move) for move in moves)
+        parts[0] = bytes((flags,))
+        self.tick = frame.tick
+        self.count += 1
+        self.cached_keyframe = None
+        return message(DELTA, frame.tick, b"".join(parts))
+
+    def keyframe(self):
+        """KEYFRAME message for the current tick, built at most once per tick."""
+        if self.cached_keyframe is None:
+            body = pack_hud(self.hud) + TURRET.pack(*self.turret)
+            body += b"".join(table.pack_all() for table in self.tables)
+            self.cached_keyframe = message(KEYFRAME, self.tick, body)
+        return self.cached_keyframe
+
+class StreamDecoder:
+    """Rebuilds Frames from the messages StreamEncoder produces."""
+    def __init__(self):
+        self.dt = 0.0
+        self.synced = False
+        self.hud = None
+        self.turret = None
+        self.entities = ({}, {}, {})
+        self.keyframes = 0
+        self.deltas = 0
+
+    def read_hud(self, body, offset):
+        hud = HUD.unpack_from(body, offset)
+        offset += HUD.size
+        end = offset + hud[-1]
+        self.hud = hud[:-1] + (body[offset:end].decode("utf-8", "replace"),)
+        return end
+
+    def decode(self, kind, tick, body):
+        """Apply one message; returns the new Frame, or None if there is nothing to show yet."""
+        if kind == HELLO:
+            version, tick_rate = HELLO_BODY.unpack_from(body)
+            if version != PROTOCOL_VERSION:
+                raise ValueError(f"unsupported spectator protocol version {version}")
+            self.dt = 1.0 / tick_rate
+            return None
+        records = (BULLET, ENEMY, POWERUP)
+        if kind == KEYFRAME:
+            offset = self.read_hud(body, 0)
+            self.turret = TURRET.unpack_from(body, offset)
+            offset += TURRET.size
+            for table, record in zip(self.entities, records):
+                table.clear()
+                (count,) = COUNT.unpack_from(body, offset)
+                offset += COUNT.size
+                for rec in record.iter_unpack(body[offset:offset + count * record.size]):
+                    table[rec[0]] = rec[1:]
+                offset += count * record.size
+            self.synced = True
+            self.keyframes += 1
+        elif kind == DELTA:
+            if not self.synced:
+                return None
+            flags = body[0]
+            offset = 1
+            if flags & DELTA_HUD:
+                offset = self.read_hud(body, offset)
+            if flags & DELTA_TURRET:
+                self.turret = TURRET.unpack_from(body, offset)
+                offset += TURRET.size
+            for table, record in zip(self.entities, records):
+                (count,) = COUNT.unpack_from(body, offset)
+                offset += COUNT.size
+                for (wid,) in WIRE_ID.iter_unpack(body[offset:offset + count * WIRE_ID.size]):
+                    del table[wid]
+                offset += count * WIRE_ID.size
+                (count,) = COUNT.unpack_from(body, offset)
+                offset += COUNT.size
+                for rec in record.iter_unpack(body[offset:offset + count * record.size]):
+                    table[rec[0]] = rec[1:]
+                offset += count * record.size
+                (count,) = COUNT.unpack_from(body, offset)
+                offset += COUNT.size
+                for wid, dx, dy in MOVE.iter_unpack(body[offset:offset + count * MOVE.size]):
+                    rec = table[wid]
+                    table[wid] = (rec[0] + dx, rec[1] + dy) + rec[2:]
+                offset += count * MOVE.size
+            self.deltas += 1
+        else:
+            raise ValueError(f"unknown spectator message type {kind}")
+        return self.frame(tick)
+
+    def frame(self, tick):
+        s = POSITION_SCALE
+        score, highscore, health, combo, level, flags, r, g, b, hud_message = self.hud
+        frame = Frame()
+        frame.tick = tick
+        frame.time = time.perf_counter()
+        frame.dt = self.dt
+        frame.turret_x = self.turret[0] / s
+        frame.turret_y = self.turret[1] / s
+        frame.turret_angle = self.turret[2] / ANGLE_SCALE
+        bullets, enemies, powerups = self.entities
+        frame.bullets = tuple((x / s, y / s, vx, vy, (cr, cg, cb), wid)
+                              for wid, (x, y, vx, vy, cr, cg, cb) in bullets.items())
+        frame.enemies = tuple((x / s, y / s, vx, vy, ENEMY_TYPES[kind], wid)
+                              for wid, (x, y, vx, vy, kind) in enemies.items())
+        frame.powerups = tuple((x / s, y / s, POWERUP_TYPES[kind], (cr, cg, cb), wid)
+                               for wid, (x, y, kind, cr, cg, cb) in powerups.items())
+        frame.score = score
+        frame.highscore = highscore
+        frame.health = health
+        frame.combo = combo
+        frame.level = level
+        frame.hud_message = hud_message
+        frame.hud_message_color = (r, g, b)
+        frame.game_over = bool(flags & FLAG_GAME_OVER)
+        frame.pause = bool(flags & FLAG_PAUSE)
+        return frame
+
+def parse_address(address):
+    """"unix:/path" -> ("unix", path); "host:port" or ":port" -> ("tcp", (host, port))."""
+    if address.startswith("unix:"):
+        return "unix", address[5:]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"bad address {address!r}, expected HOST:PORT or unix:PATH")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+class Observer:
+    __slots__ = ('writer', 'live', 'synced', 'keyframes_only')
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.live = True
+        self.synced = False
+        self.keyframes_only = 0  # Times this observer fell behind
+
+class SpectatorServer:
+    """
+    Publishes frames to observers. publish() may be called from any
+    thread; everything else happens on the server's own event loop.
+    """
+    def __init__(self, address, tick_rate):
+        self.kind, self.address = parse_address(address)
+        self.encoder = StreamEncoder(tick_rate)
+        self.observers = []
+        self.bytes_sent = 0
+        self.encode_time = 0.0
+        self.loop = asyncio.new_event_loop()
+        self.server = None
+        self.error = None
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="spectator-server", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            if self.kind == "unix":
+                start = asyncio.start_unix_server(self.handle, self.address)
+            else:
+                start = asyncio.start_server(self.handle, *self.address)
+            self.server = self.loop.run_until_complete(start)
+        except OSError as e:
+            self.error = e
+            self.ready.set()
+            return
+        if self.kind == "tcp":
+            self.address = self.server.sockets[0].getsockname()[:2]
+        self.ready.set()
+        self.loop.run_forever()
+        self.server.close()
+        for observer in self.observers:
+            observer.writer.close()  # Their handlers see EOF and return
+        handlers = asyncio.all_tasks(self.loop)
+        self.loop.run_until_complete(asyncio.gather(*handlers, return_exceptions=True))
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    async def handle(self, reader, writer):
+        observer = Observer(writer)
+        writer.write(self.encoder.hello())
+        if self.encoder.tick is not None:
+            writer.write(self.encoder.keyframe())
+            observer.synced = True
+        self.observers.append(observer)
+        try:
+            # Observers never send anything; EOF means they left
+            await reader.read()
+        except ConnectionError:
+            pass
+        finally:
+            self.observers.remove(observer)
+            writer.close()
+
+    def publish(self, frame):
+        self.loop.call_soon_threadsafe(self.broadcast, frame)
+
+    def broadcast(self, frame):
+        start = time.perf_counter()
+        encoder = self.encoder
+        tick_rate = encoder.tick_rate
+        delta = encoder.update(frame)
+        hello = encoder.hello() if encoder.tick_rate != tick_rate else None
+        keyframe_tick = encoder.count % KEYFRAME_EVERY == 0
+        for observer in self.observers:
+            writer = observer.writer
+            if writer.is_closing():
+                continue
+            if hello is not None:
+                writer.write(hello)  # Small, and every observer needs it to interpolate
+                self.bytes_sent += len(hello)
+            buffered = writer.transport.get_write_buffer_size()
+            if observer.live:
+                if buffered > HIGH_WATER:
+                    observer.live = False
+                    observer.keyframes_only += 1
+                    continue
+                data = encoder.keyframe() if keyframe_tick or not observer.synced else delta
+                observer.synced = True
+            elif keyframe_tick and buffered < HIGH_WATER:
+                data = encoder.keyframe()
+                # The keyframe resyncs it; send deltas again once it keeps up
+                observer.live = buffered <= LOW_WATER
+            else:
+                continue
+            writer.write(data)
+            self.bytes_sent += len(data)
+        self.encode_time += time.perf_counter() - start
+
+    def close(self):
+        if self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+class SpectatorClient(threading.Thread):
+    """
+    Reads a spectator stream on a background thread and publishes the
+    newest decoded Frame in self.frame, the same way SimWorker does.
+    """
+    def __init__(self, address):
+        super().__init__(name="spectator-client", daemon=True)
+        self.kind, self.address = parse_address(address)
+        self.decoder = StreamDecoder()
+        self.frame = None
+        self.connected = False
+        self.error = None
+        self.loop = asyncio.new_event_loop()
+        self.task = None
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.task = self.loop.create_task(self.receive())
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.close()
+
+    async def receive(self):
+        try:
+            if self.kind == "unix":
+                reader, writer = await asyncio.open_unix_connection(self.address)
+            else:
+                reader, writer = await asyncio.open_connection(*self.address)
+        except OSError as e:
+            self.error = e
+            return
+        self.connected = True
+        decoder = self.decoder
+        try:
+            while True:
+                length, kind, tick = HEADER.unpack(await reader.readexactly(HEADER.size))
+                frame = decoder.decode(kind, tick, await reader.readexactly(length))
+                if frame is not None:
+                    self.frame = frame
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as e:
+            self.error = e
+        finally:
+            self.connected = False
+            writer.close()
+
+    def stop(self):
+        if self.is_alive():
+            self.loop.call_soon_threadsafe(lambda: self.task.cancel())
+            self.join()
+
+def bench(observers, seconds, tick_rate):
+    """Serve the swarm benchmark scenario in real time to in-process observers."""
+    from turret_bench import make_engine, tick
+    from turret_worker import capture_frame
+
+    server = SpectatorServer("127.0.0.1:0", tick_rate)
+    address = "%s:%d" % server.address
+    clients = [SpectatorClient(address) for _ in range(observers)]
+    for client in clients:
+        client.start()
+    while not all(client.connected for client in clients):
+        time.sleep(0.01)
+    engine, hook, source = make_engine("swarm")
+    ticks = int(seconds * tick_rate)
+    dt = 1.0 / tick_rate
+    late = 0
+    next_tick = time.perf_counter()
+    for _ in range(ticks):
+        tick(engine, hook, source)
+        server.publish(capture_frame(engine))
+        next_tick += dt
+        wait = next_tick - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        else:
+            late += 1
+    time.sleep(0.2)  # Let the last messages arrive
+    server.close()
+    for client in clients:
+        client.stop()
+    print(f"{ticks} ticks at {tick_rate:g} Hz, {len(engine.enemies)} enemies, "
+          f"{len(engine.bullets)} bullets, {late} late ticks")
+    print(f"encode+send {server.encode_time / ticks * 1e6:.0f} us/tick, "
+          f"{server.bytes_sent / max(observers, 1) / seconds / 1024:.1f} KiB/s per observer")
+    for i, client in enumerate(clients):
+        decoder = client.decoder
+        last = client.frame.tick if client.frame is not None else None
+        print(f"observer {i}: {decoder.keyframes} keyframes, {decoder.deltas} deltas, "
+              f"last tick {last} of {engine.tick}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turret Defense spectator stream")
+    parser.add_argument("--bench", action="store_true",
+                        help="measure the stream at MAX_ENEMIES with local observers")
+    parser.add_argument("--observers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--tick-rate", type=tick_rate_arg, default=60.0)
+    args = parser.parse_args(argv)
+    if not args.bench:
+        parser.error("nothing to do; spectate with: python turret_game.py --spectate HOST:PORT")
+    return bench(args.observers, args.seconds, args.tick_rate)
+
+if __name__ == '__main__':
+    sys.exit(main())
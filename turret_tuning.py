@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch simulator for difficulty tuning.
+
+Plays many headless games in parallel with the lead-targeting Autopilot, one game per
+(parameter combination, seed), and streams one CSV row per game:
+
+    python turret_tuning.py --runs 200 \\
+        --grid spawn_accel=0.06,0.08,0.1 --grid level_up_score=120,150 \\
+        --output tuning.csv
+
+Grid keys are the Tuning fields: enemy_spawn_rate, spawn_accel,
+min_spawn_rate, level_up_score, enemy_level_speedup, powerup_spawn_rate,
+fast_enemy_share, spawn_jitter, starting_health, enemy_damage; the rest
+come from --mode.
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+import itertools
+from multiprocessing import Pool as ProcessPool
+
+from turret_sim import DEFAULT_TICK_RATE, GAME_MODES, GameEngine, Tuning, tick_rate_arg
+from turret_bot import Autopilot
+
+RESULT_FIELDS = ("seed", "survival_time", "level", "score", "damage_taken",
+                 "peak_entities", "game_over")
+
+def play_game(job):
+    """Worker entry point: play one game and return its result row."""
+    params, seed, max_time, tick_rate, mode = job
+    engine = GameEngine(game_mode=mode, seed=seed, tick_rate=tick_rate,
+                        tuning=Tuning.for_mode(mode, **params))
+    bot = Autopilot()
+    max_ticks = int(max_time * tick_rate)
+    damage = 0
+    peak = 0
+    for _ in range(max_ticks):
+        health = engine.health
+        engine.step(bot.control(engine))
+        if engine.health < health:
+            damage += health - engine.health
+        entities = len(engine.enemies) + len(engine.bullets) + len(engine.powerups)
+        if entities > peak:
+            peak = entities
+        if engine.game_over:
+            break
+    row = dict(params)
+    row.update(seed=seed, survival_time=round(engine.scheduler.now, 3), level=engine.level,
+               score=engine.score, damage_taken=damage, peak_entities=peak,
+               game_over=engine.game_over)
+    return row
+
+def parse_grid(specs):
+    """
+    ["spawn_accel=0.06,0.08"] -> {"spawn_accel": [0.06, 0.08]}. Values take
+    the type of the field's default, so level_up_score=120 stays an int.
+    """
+    defaults = Tuning()
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in Tuning.FIELDS or not values:
+            raise ValueError(f"bad grid entry {spec!r}, expected one of {', '.join(Tuning.FIELDS)}")
+        kind = type(getattr(defaults, name))
+        try:
+            grid[name] = [kind(v) for v in values.split(",")]
+        except ValueError:
+            raise ValueError(f"bad grid entry {spec!r}, {name} takes {kind.__name__} values") from None
+    return grid
+
+def jobs(grid, runs, base_seed, max_time, tick_rate, mode):
+    names = sorted(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(zip(names, values))
+        for run in range(runs):
+            yield (params, base_seed + run, max_time, tick_rate, mode)
+
+def summarize(rows, names):
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[n] for n in names), []).append(row)
+    for key, group in sorted(groups.items()):
+        n = len(group)
+        label = " ".join(f"{name}={value}" for name, value in zip(names, key)) or "defaults"
+        print(f"{label}: games={n} "
+              f"survival={sum(r['survival_time'] for r in group) / n:.1f}s "
+              f"level={sum(r['level'] for r in group) / n:.2f} "
+              f"score={sum(r['score'] for r in group) / n:.0f} "
+              f"damage={sum(r['damage_taken'] for r in group) / n:.1f}", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turret Defense difficulty tuning")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2",
+                        help="tuning parameter values to sweep (repeatable)")
+    parser.add_argument("--runs", type=int, default=50, help="games per parameter combination")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the first game")
+    parser.add_argument("--max-time", type=float, default=600, help="simulated seconds per game")
+    parser.add_argument("--tick-rate", type=tick_rate_arg, default=DEFAULT_TICK_RATE)
+    parser.add_argument("--mode", default="Classic", choices=GAME_MODES)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", metavar="FILE", help="CSV file (default: stdout)")
+    args = parser.parse_args(argv)
+    try:
+        grid = parse_grid(args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+
+    names = sorted(grid)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = csv.DictWriter(out, fieldnames=list(names) + list(RESULT_FIELDS))
+    writer.writeheader()
+    rows = []
+    start = time.perf_counter()
+    with ProcessPool(args.workers) as pool:
+        work = jobs(grid, args.runs, args.seed, args.max_time, args.tick_rate, args.mode)
+        for row in pool.imap_unordered(play_game, work, chunksize=4):
+            writer.writerow(row)
+            rows.append({k: row[k] for k in names + ["survival_time", "level", "score", "damage_taken"]})
+    if out is not sys.stdout:
+        out.close()
+    print(f"{len(rows)} games in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    summarize(rows, names)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Main window and start screen.
+
+Only what the start screen needs is imported up front; the game view
+(turret_view) and the score database are loaded when a mode is picked.
+Run the game with turret_game.py.
+
+@author: Keruki2004
+"""
+
+from PyQt5.QtWidgets import (
+    QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox,
+    QAction, QMainWindow, QStackedLayout, QGroupBox
+)
+from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, pyqtSignal
+
+from turret_sim import SCREEN_WIDTH, SCREEN_HEIGHT, MAX_HEALTH, DEFAULT_TICK_RATE
+
+def set_label_text(label, text):
+    # setText() relayouts the panel even when the text is unchanged
+    if label.text() != text:
+        label.setText(text)
+
+# --- START SCREEN WIDGET ---
+class StartScreenWidget(QWidget):
+    modeSelected = pyqtSignal(str)
+    def __init__(self):
+        super().__init__()
+        self.setFixedSize(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.selected_mode = None
+        self.init_ui()
+    
+    def init_ui(self):
+        vbox = QVBoxLayout()
+        vbox.setAlignment(Qt.AlignCenter)
+        
+        title = QLabel("Turret Defense")
+        title.setFont(QFont("Arial", 40, QFont.Bold))
+        title.setAlignment(Qt.AlignCenter)
+        vbox.addWidget(title)
+        
+        author = QLabel("Created by Keruki2004")
+        author.setFont(QFont("Arial", 18, QFont.Bold))
+        author.setAlignment(Qt.AlignCenter)
+        vbox.addWidget(author)
+        
+        vbox.addSpacing(40)
+        
+        menu_group = QGroupBox()
+        menu_layout = QVBoxLayout()
+        menu_layout.setAlignment(Qt.AlignCenter)
+        menu_label = QLabel("Select Game Mode:")
+        menu_label.setFont(QFont("Arial", 20, QFont.Bold))
+        menu_label.setAlignment(Qt.AlignCenter)
+        menu_layout.addWidget(menu_label)
+        
+        self.classic_btn = QPushButton("Classic")
+        self.classic_btn.setFont(QFont("Arial", 16))
+        self.classic_btn.clicked.connect(lambda: self.select_mode("Classic"))
+        menu_layout.addWidget(self.classic_btn)
+        
+        self.hardcore_btn = QPushButton("Hardcore")
+        self.hardcore_btn.setFont(QFont("Arial", 16))
+        self.hardcore_btn.clicked.connect(lambda: self.select_mode("Hardcore"))
+        menu_layout.addWidget(self.hardcore_btn)
+        
+        self.practice_btn = QPushButton("Practice")
+        self.practice_btn.setFont(QFont("Arial", 16))
+        self.practice_btn.clicked.connect(lambda: self.select_mode("Practice"))
+        menu_layout.addWidget(self.practice_btn)
+        
+        menu_group.setLayout(menu_layout)
+        vbox.addWidget(menu_group)
+        
+        self.setLayout(vbox)
+    
+    def select_mode(self, mode):
+        self.selected_mode = mode
+        self.modeSelected.emit(mode)
+
+class MainWindow(QMainWindow):
+    def __init__(self, tick_rate=DEFAULT_TICK_RATE, record_path=None, replay_path=None,
+                 profile_log=None, quality="auto", spectators=None, event_log=None):
+        super().__init__()
+        self.tick_rate = tick_rate
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.profile_log = profile_log
+        self.quality = quality
+        self.spectators = spectators
+        self.event_log = event_log
+        self.scores = None  # Opened with the first game screen
+        self.setWindowTitle("Turret Defense")
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        self.stacked_layout = QStackedLayout()
+        self.central_widget.setLayout(self.stacked_layout)
+        self.start_screen = StartScreenWidget()
+        self.start_screen.modeSelected.connect(self.start_game)
+        self.stacked_layout.addWidget(self.start_screen)
+        self.game_widget = None
+        self.side_controls_widget = None
+        self.game_screen_widget = QWidget()
+        self.game_screen_layout = QHBoxLayout()
+        self.game_screen_widget.setLayout(self.game_screen_layout)
+        self.stacked_layout.addWidget(self.game_screen_widget)
+        self.init_menubar()
+
+    def init_game_screen(self, selected_mode):
+        if self.game_widget is not None:
+            self.game_widget.restart(selected_mode)
+            self.reset_button.setEnabled(False)
+            return
+
+        # The game view and everything it pulls in load only now, after the
+        # start screen has been on screen
+        from turret_view import GameWidget
+        from turret_scores import ScoreStore
+        if self.scores is None:
+            self.scores = ScoreStore()
+        self.game_widget = GameWidget(game_mode=selected_mode, tick_rate=self.tick_rate,
+                                      record_path=self.record_path,
+                                      replay_path=self.replay_path,
+                                      profile_log=self.profile_log,
+                                      quality=self.quality,
+                                      scores=self.scores,
+                                      spectators=self.spectators,
+                                      event_log=self.event_log)
+        self.side_controls_widget = QWidget()
+        controls_layout = QVBoxLayout()
+        controls_layout.setAlignment(Qt.AlignTop)
+        self.score_label = QLabel("Score: 0")
+        self.health_label = QLabel(f"Health: {self.game_widget.frame.health}/{MAX_HEALTH}")
+        self.highscore_label = QLabel(f"High Score: {self.game_widget.highscore}")
+        self.combo_label = QLabel("")
+        self.level_label = QLabel("Level: 1")
+        font = QFont()
+        font.setPointSize(14)
+        self.score_label.setFont(font)
+        self.health_label.setFont(font)
+        self.highscore_label.setFont(font)
+        self.combo_label.setFont(font)
+        self.level_label.setFont(font)
+        controls_layout.addWidget(self.score_label)
+        controls_layout.addWidget(self.health_label)
+        controls_layout.addWidget(self.highscore_label)
+        controls_layout.addWidget(self.level_label)
+        controls_layout.addWidget(self.combo_label)
+        controls_layout.addStretch(1)
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset_game)
+        self.reset_button.setEnabled(False)
+        controls_layout.addWidget(self.reset_button)
+        self.side_controls_widget.setLayout(controls_layout)
+        self.game_screen_layout.addWidget(self.game_widget)
+        self.game_screen_layout.addWidget(self.side_controls_widget)
+        self.game_widget.scoreChanged.connect(self.update_score_label)
+        self.game_widget.healthChanged.connect(self.update_health_label)
+        self.game_widget.gameOverSignal.connect(self.on_game_over)
+        self.game_widget.highScoreChanged.connect(self.update_highscore_label)
+        self.game_widget.comboChanged.connect(self.update_combo_label)
+        self.game_widget.levelChanged.connect(self.update_level_label)
+        self.game_widget.levelUpSignal.connect(self.on_level_up)
+
+    def closeEvent(self, event):
+        if self.game_widget is not None:
+            self.game_widget.stop()
+        if self.spectators is not None:
+            self.spectators.close()
+        if self.event_log is not None:
+            self.event_log.close()
+        if self.scores is not None:
+            self.scores.close()
+        super().closeEvent(event)
+
+    def start_game(self, mode):
+        self.init_game_screen(mode)
+        self.stacked_layout.setCurrentWidget(self.game_screen_widget)
+
+    def reset_game(self):
+        if self.game_widget is None:
+            return
+        self.init_game_screen(self.game_widget.game_mode)
+        self.stacked_layout.setCurrentWidget(self.game_screen_widget)
+        self.game_widget.setFocus()
+
+    def show_about_dialog(self):
+        QMessageBox.information(self, "About Turret Defense",
+            "Turret Defense Minigame\n\nCreated by Keruki2004\n\nShoot incoming enemies, collect powerups, and survive as long as you can!\n\nPython & PyQt5.")
+
+    def show_controls_dialog(self):
+        QMessageBox.information(self, "Controls",
+            "Mouse: Aim\nLeft Click: Fire\nArrow Keys: Move Turret\nSpace: Fire (hold for rapid-fire)\nP: Pause/Resume\nO: Performance Overlay\nF5/F9: Quick Save/Load\nBackspace: Rewind\nReset Button/Menu: Restart Game")
+
+    def update_score_label(self, score):
+        set_label_text(self.score_label, f"Score: {score}")
+
+    def update_health_label(self, health):
+        set_label_text(self.health_label, f"Health: {health}/{MAX_HEALTH}")
+
+    def update_highscore_label(self, hs):
+        set_label_text(self.highscore_label, f"High Score: {hs}")
+
+    def update_combo_label(self, combo):
+        set_label_text(self.combo_label, f"COMBO x{combo}!" if combo > 1 else "")
+
+    def update_level_label(self, level):
+        set_label_text(self.level_label, f"Level: {level}")
+
+    def on_level_up(self, level):
+        pass
+
+    def on_game_over(self):
+        self.reset_button.setEnabled(True)
+        QMessageBox.information(self, "Game Over", "Game Over! Click Reset to play again.")
+
+    def init_menubar(self):
+        menubar = self.menuBar()
+        game_menu = menubar.addMenu("Game")
+        help_menu = menubar.addMenu("Help")
+        reset_action = QAction("Reset Game", self)
+        reset_action.triggered.connect(self.reset_game)
+        game_menu.addAction(reset_action)
+        exit_action = QAction("Exit", self)
+        exit_action.triggered.connect(self.close)
+        game_menu.addAction(exit_action)
+        about_action = QAction("About", self)
+        about_action.triggered.connect(self.show_about_dialog)
+        help_menu.addAction(about_action)
+        controls_action = QAction("Controls", self)
+        controls_action.triggered.connect(self.show_controls_dialog)
+        help_menu.addAction(controls_action)
@@ -0,0 +1,893 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Qt views of a running game: GameWidget plays one, SpectatorWidget shows
+one streamed by another process, and both paint Frames through
+FrameView.
+
+turret_ui imports this module only when the first game screen is
+built, so the start screen never waits for it.
+
+@author: Keruki2004
+"""
+
+import time
+from collections import deque
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter, QBrush, QPen, QColor, QFont, QPixmap, QRegion
+from PyQt5.QtCore import Qt, QTimer, QRectF, QPointF, pyqtSignal, QRect
+
+from turret_sim import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, TURRET_WIDTH, TURRET_HEIGHT, BULLET_RADIUS,
+    ENEMY_RADIUS, POWERUP_RADIUS, MAX_HEALTH, DEFAULT_TICK_RATE,
+    KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN, WHITE, GameEngine,
+    save_snapshot, load_snapshot
+)
+from turret_replay import ReplayReader, ReplayWriter
+from turret_profiler import FrameProfiler, StepTimer, SampleWriter, PHASES, PHASE_INPUT, PHASE_PAINT
+from turret_worker import SimWorker, InputQueue, capture_frame
+from turret_quality import QualityGovernor, TIERS
+from turret_effects import ParticleSystem, SPRITES as PARTICLE_SPRITES, PARTICLE_CAPACITY
+
+# --- View Constants ---
+HEALTH_BAR_WIDTH = 150
+HEALTH_BAR_HEIGHT = 20
+# Colors are RGB(A) tuples; SpriteCache turns them into Qt brushes
+HEALTH_BAR_COLOR = (0, 200, 0)
+HEALTH_BAR_BG_COLOR = (50, 50, 50)
+GAME_OVER_COLOR = (255, 50, 0, 150)
+
+# Screen areas the HUD layer can draw into, repainted when the HUD changes
+HUD_RECTS = (
+    QRect(9, 9, HEALTH_BAR_WIDTH + 2, HEALTH_BAR_HEIGHT + 2),
+    QRect(0, 26, 200, 30),
+    QRect(190, 0, 320, 36),
+    QRect(0, 100, SCREEN_WIDTH, SCREEN_HEIGHT - 400),
+)
+FRAME_INTERVAL_MS = 8   # Render loop polling interval
+DIRTY_RECT_LIMIT = 128  # Beyond this many rects a full repaint is cheaper
+TURRET_REACH = 32       # Half-size of the box covering body and barrel
+PROFILER_RECT = QRect(SCREEN_WIDTH - 250, SCREEN_HEIGHT - 200, 240, 190)
+PROFILER_STATS_EVERY = 15  # Frames between percentile refreshes
+QUICKSAVE_FILE = "quicksave.json"
+REWIND_EVERY = 1.0  # Sim seconds between rewind snapshots
+REWIND_DEPTH = 10   # Snapshots kept for rewinding
+HUD_PUBLISH_INTERVAL = 1 / 30  # Shortest gap between side panel updates (s)
+EFFECT_EVENTS = ("kill", "damage", "pickup")
+MAX_PENDING_EFFECTS = 128  # Effects queued by the worker and not yet spawned
+PARTICLE_REACH = max(radius for radius, color in PARTICLE_SPRITES) + 2
+
+ARROW_KEYS = {Qt.Key_Left: KEY_LEFT, Qt.Key_Right: KEY_RIGHT,
+              Qt.Key_Up: KEY_UP, Qt.Key_Down: KEY_DOWN}
+
+class SpriteCache:
+    """
+    Pre-rendered entity pixmaps plus the pens, brushes and fonts used every
+    frame, so paintEvent never builds Qt paint objects per entity.
+    """
+    def __init__(self):
+        self.enemies = {
+            'normal': self.circle(ENEMY_RADIUS, QColor(Qt.red)),
+            'fast': self.circle(ENEMY_RADIUS, QColor(Qt.yellow)),
+        }
+        self.particles, self.particle_sources = self.particle_atlas()
+        self.bullets = {}
+        self.powerups = {}
+        self.background = QBrush(Qt.black)
+        self.turret_body = QBrush(Qt.darkBlue)
+        self.turret_barrel = QBrush(Qt.gray)
+        self.turret_pen = QPen(Qt.black, 1)
+        self.health_bg = QBrush(QColor(*HEALTH_BAR_BG_COLOR))
+        self.health_fg = QBrush(QColor(*HEALTH_BAR_COLOR))
+        self.health_pen = QPen(Qt.black)
+        self.game_over_brush = QBrush(QColor(*GAME_OVER_COLOR))
+        self.level_color = QColor(0,255,255)
+        self.combo_color = QColor(255,255,0)
+        self.hud_font = QFont("Arial",18,QFont.Bold)
+        self.message_font = QFont("Arial", 28, QFont.Bold)
+        self.pause_font = QFont("Arial",32,QFont.Bold)
+        self.icon_font = QFont("Arial",12,QFont.Bold)
+        self.mono_font = QFont("Monospace", 9)
+        self.mono_font.setStyleHint(QFont.TypeWriter)
+        self.game_over_font = QFont()
+        self.game_over_font.setPointSize(36)
+        self.game_over_font.setBold(True)
+        self.final_score_font = QFont("Arial", 20)
+        self.final_level_font = QFont("Arial", 20, QFont.Bold)
+        self.overlay_brush = QBrush(QColor(0, 0, 0, 180))
+        self.histogram_brush = QBrush(QColor(0, 200, 0))
+        self.message_colors = {}
+
+    @staticmethod
+    def circle(radius, color, pen=Qt.NoPen, icon=None, font=None):
+        # One pixel margin so an outline pen is not clipped
+        size = 2 * radius + 2
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setBrush(QBrush(color))
+        painter.setPen(pen)
+        painter.drawEllipse(1, 1, 2 * radius, 2 * radius)
+        if icon:
+            painter.setPen(Qt.black)
+            painter.setFont(font)
+            painter.drawText(QRectF(1, 1, 2 * radius, 2 * radius), Qt.AlignCenter, icon)
+        painter.end()
+        return pixmap
+
+    @classmethod
+    def particle_atlas(cls):
+        """
+        Every particle sprite side by side in one pixmap, so all particles
+        draw with a single call, plus each sprite's (left, size) in it.
+        """
+        sprites = [cls.circle(radius, QColor(*color)) for radius, color in PARTICLE_SPRITES]
+        atlas = QPixmap(sum(sprite.width() for sprite in sprites),
+                        max(sprite.height() for sprite in sprites))
+        atlas.fill(Qt.transparent)
+        painter = QPainter(atlas)
+        sources = []
+        left = 0
+        for sprite in sprites:
+            painter.drawPixmap(left, 0, sprite)
+            sources.append((left, sprite.width()))
+            left += sprite.width()
+        painter.end()
+        return atlas, tuple(sources)
+
+    def bullet(self, color):
+        sprite = self.bullets.get(color)
+        if sprite is None:
+            sprite = self.bullets[color] = self.circle(BULLET_RADIUS, QColor(*color))
+        return sprite
+
+    def powerup(self, kind, color, simple=False):
+        key = (kind, color, simple)
+        sprite = self.powerups.get(key)
+        if sprite is None:
+            if simple:
+                sprite = self.circle(POWERUP_RADIUS, QColor(*color))
+            else:
+                icon = "+" if kind=='health' else "R"
+                sprite = self.circle(POWERUP_RADIUS, QColor(*color), QPen(Qt.white), icon, self.icon_font)
+            self.powerups[key] = sprite
+        return sprite
+
+    def message_color(self, color):
+        qcolor = self.message_colors.get(color)
+        if qcolor is None:
+            qcolor = self.message_colors[color] = QColor(*color)
+        return qcolor
+
+_sprite_cache = None
+
+def sprite_cache():
+    # Pixmaps need a running QApplication, so build on first use
+    global _sprite_cache
+    if _sprite_cache is None:
+        _sprite_cache = SpriteCache()
+    return _sprite_cache
+
+def draw_batch(painter, pixmap, entities, lag=0.0):
+    """
+    Draw every entity centered on its position with one painter call.
+    Entities are frame tuples starting (x, y) or (x, y, speed_x, speed_y);
+    moving ones are drawn `lag` seconds behind their simulated position.
+    """
+    if not entities:
+        return
+    source = QRectF(pixmap.rect())
+    fragment = QPainter.PixmapFragment.create
+    if lag:
+        fragments = [fragment(QPointF(e[0] - e[2] * lag, e[1] - e[3] * lag), source)
+                     for e in entities]
+    else:
+        fragments = [fragment(QPointF(e[0], e[1]), source) for e in entities]
+    painter.drawPixmapFragments(fragments, pixmap)
+
+def draw_entities(painter, sprites, frame, lag=0.0, tier=TIERS[0]):
+    groups = {}
+    bullets = frame.bullets
+    if tier.max_bullets is not None:
+        bullets = bullets[:tier.max_bullets]
+    for bullet in bullets:
+        groups.setdefault(sprites.bullet(bullet[4]), []).append(bullet)
+    for enemy in frame.enemies:
+        groups.setdefault(sprites.enemies[enemy[4]], []).append(enemy)
+    for pixmap, entities in groups.items():
+        draw_batch(painter, pixmap, entities, lag)
+    groups = {}
+    for powerup in frame.powerups:
+        groups.setdefault(sprites.powerup(powerup[2], powerup[3], tier.simple_powerups),
+                          []).append(powerup)
+    for pixmap, entities in groups.items():
+        draw_batch(painter, pixmap, entities)
+
+class ParticleRenderer:
+    """
+    Draws a ParticleSystem from the sprite atlas, fading each particle
+    with its remaining life. The fragments are allocated once, one per
+    particle slot, and refilled in place every paint.
+    """
+    def __init__(self, sprites, capacity=PARTICLE_CAPACITY):
+        self.atlas = sprites.particles
+        self.sources = sprites.particle_sources
+        self.fragments = []
+        for _ in range(capacity):
+            fragment = QPainter.PixmapFragment()
+            fragment.scaleX = fragment.scaleY = 1.0
+            self.fragments.append(fragment)
+
+    def draw(self, painter, particles, limit=None):
+        xs = particles.x
+        ys = particles.y
+        lives = particles.life
+        max_lives = particles.max_life
+        kinds = particles.sprite
+        sources = self.sources
+        fragments = self.fragments
+        n = 0
+        for i in particles.slots():
+            life = lives[i]
+            if life <= 0:
+                continue
+            fragment = fragments[n]
+            left, size = sources[kinds[i]]
+            fragment.x = xs[i]
+            fragment.y = ys[i]
+            fragment.sourceLeft = left
+            fragment.width = fragment.height = size
+            fragment.opacity = life / max_lives[i]
+            n += 1
+        # Over the limit, drop the oldest particles: they are the most faded
+        start = n - limit if limit is not None and n > limit else 0
+        if n:
+            painter.drawPixmapFragments(fragments[start:n], self.atlas)
+
+def entity_rects(frame, lag=0.0, max_bullets=None):
+    """Screen rects covering everything draw_entities/draw_turret paint."""
+    reach = TURRET_REACH
+    rects = [QRect(int(frame.turret_x) - reach, int(frame.turret_y) - reach,
+                   2 * reach + 1, 2 * reach + 1)]
+    bullets = frame.bullets if max_bullets is None else frame.bullets[:max_bullets]
+    for entities, radius in ((bullets, BULLET_RADIUS), (frame.enemies, ENEMY_RADIUS)):
+        half = radius + 2
+        size = 2 * half + 1
+        for e in entities:
+            rects.append(QRect(int(e[0] - e[2] * lag) - half, int(e[1] - e[3] * lag) - half,
+                               size, size))
+    half = POWERUP_RADIUS + 2
+    size = 2 * half + 1
+    for p in frame.powerups:
+        rects.append(QRect(int(p[0]) - half, int(p[1]) - half, size, size))
+    return rects
+
+def draw_turret(painter, frame, sprites):
+    painter.setBrush(sprites.turret_body)
+    painter.setPen(sprites.turret_pen)
+    painter.drawRect(int(frame.turret_x - TURRET_WIDTH / 2), int(frame.turret_y - TURRET_HEIGHT / 2),
+                     TURRET_WIDTH, TURRET_HEIGHT)
+    painter.save()
+    painter.translate(frame.turret_x, frame.turret_y)
+    painter.rotate(frame.turret_angle)
+    painter.setBrush(sprites.turret_barrel)
+    painter.drawRect(0, -3, 30, 6)
+    painter.restore()
+
+class HudModel:
+    """
+    Last published side panel values. update() takes the current values
+    and returns only those that differ, so a frame with several hits
+    publishes one score change instead of one per hit.
+    """
+    def __init__(self):
+        self.values = {}
+
+    def update(self, **values):
+        changed = {k: v for k, v in values.items() if self.values.get(k) != v}
+        self.values.update(changed)
+        return changed
+
+    def reset(self):
+        self.values = {}
+
+class FrameView(QWidget):
+    """
+    Paints Frames: turret, entities and the HUD overlay, repainting only
+    what changed. Subclasses call show_frame() with each new frame; the
+    damage region, the HUD layer and paintEvent all work from that frame
+    (drawn_frame), never from one a worker thread may have replaced since.
+    """
+    qualityChanged = pyqtSignal(str, str)  # Tier name, what it turns off
+
+    def __init__(self, quality="auto"):
+        super().__init__()
+        self.governor = QualityGovernor()
+        self.governor.listeners.append(self.on_quality_change)
+        if quality != "auto":
+            self.governor.enabled = False
+            self.governor.level = [tier.name for tier in TIERS].index(quality)
+        self.show_profiler = False
+        self.profiler = None
+        self.profiler_stats = None
+        self.profiled_frame = None  # Newest frame whose step times were merged
+        self.setFixedSize(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.sprites = sprite_cache()
+        self.hud_layer = QPixmap(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.hud_skipped = 0
+        self.pause = False
+        self.lag = 0.0
+        self.frame = None
+        self.drawn_frame = None
+        self.particles = ParticleSystem()
+        self.particle_renderer = ParticleRenderer(self.sprites)
+        self.particles_time = time.perf_counter()
+        FrameView.refresh_view(self)
+
+    def refresh_view(self):
+        """Repaint everything on the next frame."""
+        self.painted_rects = []
+        self.hud_state = None
+        self.full_repaint = True
+
+    def animating(self):
+        """True while particles need repainting even without a new frame."""
+        return self.particles.count > 0 and not self.pause
+
+    def show_frame(self, frame):
+        """Repaint what changed since the last frame shown, with entities interpolated."""
+        self.drawn_frame = frame
+        now = time.perf_counter()
+        if frame.game_over or self.pause:
+            self.lag = 0.0
+        else:
+            self.lag = min(max(frame.dt - (now - frame.time), 0.0), frame.dt)
+        if not self.pause:
+            # Wall clock, so effects play out after game over as well
+            self.particles.update(now - self.particles_time)
+        self.particles_time = now
+        region = self.damage_region()
+        self.full_repaint = False
+        if region is None:
+            self.update()
+        else:
+            self.update(region)
+
+    def on_quality_change(self, change):
+        self.hud_state = None
+        self.full_repaint = True
+        self.qualityChanged.emit(change.new.name, change.new.describe())
+
+    def damage_region(self):
+        """
+        Region covering entities at their old and new positions plus any
+        HUD element that changed, or None when a full repaint is needed.
+        """
+        frame = self.drawn_frame
+        rects = entity_rects(frame, self.lag, self.governor.tier.max_bullets)
+        bounds = self.particles.bounds
+        if bounds is not None:
+            left, top, right, bottom = bounds
+            reach = PARTICLE_REACH
+            rects.append(QRect(int(left) - reach, int(top) - reach,
+                               int(right - left) + 2 * reach + 1, int(bottom - top) + 2 * reach + 1))
+        dirty = self.painted_rects + rects
+        self.painted_rects = rects
+        if self.render_hud_layer():
+            dirty.extend(HUD_RECTS)
+        if self.show_profiler:
+            dirty.append(PROFILER_RECT)
+        if self.full_repaint or frame.game_over or len(dirty) > DIRTY_RECT_LIMIT:
+            return None
+        region = QRegion()
+        for rect in dirty:
+            region = region.united(rect)
+        return region
+
+    def render_hud_layer(self):
+        """Redraw the cached HUD overlay if drawn_frame changed its content."""
+        frame = self.drawn_frame
+        state = (frame.health, frame.level, frame.combo,
+                 frame.hud_message, frame.hud_message_color)
+        if state == self.hud_state:
+            return False
+        tier = self.governor.tier
+        if self.hud_state is not None and self.hud_skipped < tier.hud_every - 1:
+            self.hud_skipped += 1
+            return False
+        self.hud_skipped = 0
+        self.hud_state = state
+        sprites = self.sprites
+        self.hud_layer.fill(Qt.transparent)
+        painter = QPainter(self.hud_layer)
+        painter.setRenderHint(QPainter.Antialiasing, tier.antialias)
+        self.draw_health_bar(painter, frame)
+        painter.setPen(sprites.level_color)
+        painter.setFont(sprites.hud_font)
+        painter.drawText(10, 48, f"Level: {frame.level}")
+        if frame.combo > 1:
+            painter.setPen(sprites.combo_color)
+            painter.drawText(200,28, f"Combo x{frame.combo}!")
+        if frame.hud_message:
+            painter.setPen(sprites.message_color(frame.hud_message_color))
+            painter.setFont(sprites.message_font)
+            painter.drawText(self.rect().adjusted(0,100,0,-300), Qt.AlignHCenter | Qt.AlignTop, frame.hud_message)
+        painter.end()
+        return True
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        frame = self.drawn_frame
+        sprites = self.sprites
+        if frame is None:
+            painter = QPainter(self)
+            painter.fillRect(event.rect(), sprites.background)
+            painter.end()
+            return
+        tier = self.governor.tier
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing, tier.antialias)
+        # Qt clips this painter to the damaged region passed to update()
+        painter.fillRect(event.rect(), sprites.background)
+        draw_turret(painter, frame, sprites)
+        draw_entities(painter, sprites, frame, self.lag, tier)
+        if self.particles.count:
+            self.particle_renderer.draw(painter, self.particles, tier.max_particles)
+        # The HUD layer is only redrawn by damage_region(), which also
+        # invalidates HUD_RECTS when it changes
+        painter.drawPixmap(0, 0, self.hud_layer)
+        if frame.game_over:
+            self.draw_game_over_screen(painter, frame)
+        if self.pause and not frame.game_over:
+            painter.setPen(Qt.white)
+            painter.setFont(sprites.pause_font)
+            painter.drawText(self.rect(), Qt.AlignCenter, "PAUSED")
+        prof = self.profiler
+        if prof is not None and self.show_profiler:
+            self.draw_profiler(painter, prof)
+        painter.end()
+        elapsed = time.perf_counter() - start
+        self.governor.record(elapsed * 1000)
+        if prof is not None:
+            # A frame painted again (e.g. for particles) has no new step to count
+            if frame is not self.profiled_frame and frame.phases is not None:
+                prof.merge(frame.phases)
+            self.profiled_frame = frame
+            prof.add(PHASE_PAINT, elapsed)
+            prof.end_frame((len(frame.enemies), len(frame.bullets), len(frame.powerups)))
+
+    def draw_profiler(self, painter, prof):
+        if self.profiler_stats is None or prof.frame % PROFILER_STATS_EVERY == 0:
+            self.profiler_stats = prof.percentiles()
+        stats = self.profiler_stats
+        sprites = self.sprites
+        rect = PROFILER_RECT
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(sprites.overlay_brush)
+        painter.drawRect(rect)
+        painter.setPen(Qt.white)
+        painter.setFont(sprites.mono_font)
+        x = rect.left() + 6
+        y = rect.top() + 14
+        painter.drawText(x, y, f"{'ms':<11}{'p50':>6}{'p95':>6}{'p99':>6}")
+        for name in ("frame",) + PHASES:
+            y += 13
+            p50, p95, p99 = stats[name]
+            painter.drawText(x, y, f"{name:<11}{p50:6.2f}{p95:6.2f}{p99:6.2f}")
+        y += 15
+        enemies, bullets, powerups = prof.latest_counts()
+        painter.drawText(x, y, f"E {enemies}  B {bullets}  P {powerups}")
+        y += 13
+        painter.drawText(x, y, f"quality {self.governor.tier.name}")
+        # Frame time histogram, 0..33 ms left to right
+        counts = prof.histogram()
+        peak = max(max(counts), 1)
+        bar_width = (rect.width() - 12) // len(counts)
+        base = rect.bottom() - 4
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(sprites.histogram_brush)
+        for i, count in enumerate(counts):
+            height = int(40 * count / peak)
+            painter.drawRect(x + i * bar_width, base - height, bar_width - 1, height)
+
+    def draw_health_bar(self, painter, frame):
+        painter.setBrush(self.sprites.health_bg)
+        painter.setPen(self.sprites.health_pen)
+        painter.drawRect(10, 10, HEALTH_BAR_WIDTH, HEALTH_BAR_HEIGHT)
+        health_percentage = max(0, frame.health / MAX_HEALTH)
+        health_width = int(HEALTH_BAR_WIDTH * health_percentage)
+        painter.setBrush(self.sprites.health_fg)
+        painter.drawRect(10, 10, health_width, HEALTH_BAR_HEIGHT)
+
+    def draw_game_over_screen(self, painter, frame):
+        sprites = self.sprites
+        painter.setBrush(sprites.game_over_brush)
+        painter.drawRect(self.rect())
+        painter.setFont(sprites.game_over_font)
+        painter.setPen(Qt.white)
+        text = "Game Over!"
+        painter.drawText(self.rect(), Qt.AlignCenter, text)
+        score_text = f"Score: {frame.score}"
+        painter.setFont(sprites.final_score_font)
+        painter.drawText(self.rect(), Qt.AlignBottom | Qt.AlignCenter, score_text)
+        hs_text = f"High Score: {frame.highscore}"
+        painter.drawText(self.rect().adjusted(0,-50,0,-20), Qt.AlignBottom | Qt.AlignCenter, hs_text)
+        painter.setFont(sprites.final_level_font)
+        painter.drawText(self.rect().adjusted(0,-100,0,-60), Qt.AlignBottom | Qt.AlignCenter, f"Level Reached: {frame.level}")
+
+class GameWidget(FrameView):
+    """
+    View and controller for one game. The engine runs on a SimWorker
+    thread: methods marked "worker thread" below only run there (directly
+    from run_step or posted with worker.call), everything else runs on
+    the GUI thread and reads the game only through self.frame.
+    """
+    scoreChanged = pyqtSignal(int)
+    healthChanged = pyqtSignal(int)
+    gameOverSignal = pyqtSignal()
+    highScoreChanged = pyqtSignal(int)
+    comboChanged = pyqtSignal(int)
+    levelChanged = pyqtSignal(int)
+    levelUpSignal = pyqtSignal(int)
+
+    def __init__(self, game_mode="Classic", tick_rate=DEFAULT_TICK_RATE,
+                 record_path=None, replay_path=None, profile_log=None, scores=None,
+                 quality="auto", spectators=None, event_log=None):
+        super().__init__(quality)
+        self.scores = scores
+        self.spectators = spectators
+        if profile_log:
+            self.profiler = FrameProfiler(sink=SampleWriter(profile_log))
+        self.event_log = event_log
+        self.replay_path = replay_path
+        self.replay = ReplayReader(replay_path) if replay_path else None
+        if self.replay is not None:
+            game_mode = self.replay.game_mode
+            tick_rate = self.replay.tick_rate
+        self.game_mode = game_mode
+        self.record_path = record_path
+        self.recorder = None
+        self.setMouseTracking(True)
+        self.highscore = scores.best(game_mode) if scores is not None else 0
+        self.engine = GameEngine(game_mode=game_mode, highscore=self.highscore,
+                                 tick_rate=tick_rate)
+        self.step_timer = StepTimer()  # Worker thread side of the profiler
+        self.engine.profiler = self.step_timer if self.profiler is not None else None
+        self.inputs = InputQueue()
+        self.effects = deque(maxlen=MAX_PENDING_EFFECTS)  # Filled by the worker thread
+        self.rewind = deque(maxlen=REWIND_DEPTH)
+        self.hud = HudModel()
+        self.hud_signals = {"score": self.scoreChanged, "health": self.healthChanged,
+                            "highscore": self.highScoreChanged, "combo": self.comboChanged,
+                            "level": self.levelChanged}
+        self.hud_published = 0.0
+        self.keys = 0
+        # Bumped by restart() on the GUI thread; the worker copies it into
+        # sim_generation once the new game is set up
+        self.generation = 0
+        self.sim_generation = 0
+        self.init_game()
+        self.refresh_view()
+        self.worker = SimWorker(self.run_step, self.engine.dt)
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.update_game)
+        self.worker.start()
+        self.timer.start(FRAME_INTERVAL_MS)
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    @property
+    def game_over(self):
+        return self.frame.game_over
+
+    def init_game(self):
+        """Worker thread: set up a new game and publish its first frame."""
+        if self.replay is not None:
+            self.engine.init_game(self.replay.seed)
+            self.replay_inputs = iter(self.replay)
+        else:
+            self.engine.init_game(game_mode=self.game_mode)
+        if self.record_path:
+            self.recorder = ReplayWriter(self.record_path, self.engine.seed,
+                                         self.engine.tick_rate, self.game_mode)
+        if self.event_log is not None:
+            self.event_log.start_session(self.engine.seed, self.engine.tick_rate, self.game_mode)
+        self.inputs.reset()
+        self.replay_done = False
+        self.rewind.clear()
+        self.next_rewind_tick = 0
+        self.publish_frame()
+
+    def publish_frame(self, phases=None):
+        """Worker thread: capture the engine for the view and any spectators."""
+        self.frame = capture_frame(self.engine, phases, self.sim_generation)
+        if self.spectators is not None:
+            self.spectators.publish(self.frame)
+
+    def restart(self, game_mode=None):
+        """Start a new game in place, keeping the widget, its timer and the HUD."""
+        self.pause = False
+        self.keys = 0
+        self.particles.clear()
+        self.effects.clear()
+        self.refresh_view()  # Clears the game over tint and republishes the side panel
+        # Frames and effects the worker still makes for the old game are dropped
+        self.generation += 1
+        generation = self.generation
+        self.worker.call(lambda: self.restart_game(game_mode, generation))
+
+    def restart_game(self, game_mode, generation):
+        """Worker thread."""
+        self.sim_generation = generation
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.replay is not None:
+            self.replay.file.close()
+            self.replay = ReplayReader(self.replay_path)
+        elif game_mode is not None:
+            self.game_mode = game_mode
+        self.highscore = self.scores.best(self.game_mode) if self.scores is not None else 0
+        self.engine.highscore = self.highscore
+        self.init_game()
+
+    def refresh_view(self):
+        """Repaint everything and republish the side panel from the next frame."""
+        self.hud.reset()
+        self.hud_published = 0.0
+        super().refresh_view()
+
+    def can_restore(self):
+        # Jumping to another state would desync a recording or a replay
+        return self.replay is None and self.record_path is None
+
+    def jumped(self):
+        """Worker thread: the engine was restored, publish it at once."""
+        engine = self.engine
+        self.worker.dt = engine.dt
+        self.game_mode = engine.game_mode
+        if self.event_log is not None:
+            self.event_log.restore(engine.tick, engine.level, engine.combo_count, engine.score)
+        self.publish_frame()
+
+    def time_steps(self, timed):
+        """Worker thread."""
+        self.engine.profiler = self.step_timer if timed else None
+
+    def quick_save(self):
+        """Worker thread."""
+        try:
+            save_snapshot(QUICKSAVE_FILE, self.engine.snapshot())
+        except OSError:
+            self.engine.show_hud_message("SAVE FAILED", (255,80,80))
+        else:
+            self.engine.show_hud_message("GAME SAVED", WHITE)
+        self.publish_frame()
+
+    def quick_load(self):
+        """Worker thread."""
+        try:
+            snapshot = load_snapshot(QUICKSAVE_FILE)
+            self.engine.restore(snapshot)
+        except (OSError, ValueError, KeyError):
+            self.engine.show_hud_message("NO SAVED GAME", (255,80,80))
+            self.publish_frame()
+            return
+        self.engine.show_hud_message("GAME LOADED", WHITE)
+        self.rewind.clear()
+        self.next_rewind_tick = self.engine.tick
+        self.jumped()
+
+    def rewind_step(self):
+        """Worker thread: jump back to the newest rewind snapshot at least half a second old."""
+        if not self.rewind:
+            return
+        min_age = self.engine.tick_rate / 2
+        tick, snapshot = self.rewind.pop()
+        while self.rewind and self.engine.tick - tick < min_age:
+            tick, snapshot = self.rewind.pop()
+        self.engine.restore(snapshot)
+        self.next_rewind_tick = tick + max(1, round(REWIND_EVERY * self.engine.tick_rate))
+        self.jumped()
+
+    def mouseMoveEvent(self, event):
+        self.inputs.put("mouse", (event.pos().x(), event.pos().y()))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and not self.game_over and not self.pause:
+            self.inputs.put("click")
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key == Qt.Key_P:
+            self.pause = not self.pause
+            self.inputs.put("pause", self.pause)
+            self.full_repaint = True
+        elif key == Qt.Key_O:
+            self.toggle_profiler()
+        elif key == Qt.Key_F5:
+            self.worker.call(self.quick_save)
+        elif key in (Qt.Key_F9, Qt.Key_Backspace) and self.can_restore():
+            self.worker.call(self.quick_load if key == Qt.Key_F9 else self.rewind_step)
+            self.refresh_view()
+        elif key == Qt.Key_Space:
+            if not self.pause and not self.game_over:
+                self.inputs.put("space")
+        elif key in ARROW_KEYS:
+            self.keys |= ARROW_KEYS[key]
+            self.inputs.put("keys", self.keys)
+
+    def keyReleaseEvent(self, event):
+        if event.key() in ARROW_KEYS:
+            self.keys &= ~ARROW_KEYS[event.key()]
+            self.inputs.put("keys", self.keys)
+        elif event.key() == Qt.Key_Space:
+            self.inputs.put("space_held", False)
+
+    def take_input(self):
+        """Worker thread."""
+        if self.replay is not None:
+            return next(self.replay_inputs, None)
+        return self.inputs.take()
+
+    def stop(self):
+        self.worker.stop()
+        self.timer.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.profiler is not None:
+            self.profiler.close()
+
+    def toggle_profiler(self):
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler and self.profiler is None:
+            self.profiler = FrameProfiler()
+        elif not self.show_profiler and self.profiler is not None and self.profiler.sink is None:
+            self.profiler = None  # Nothing is logging, stop timing
+        timed = self.profiler is not None
+        self.worker.call(lambda: self.time_steps(timed))
+        self.profiler_stats = None
+        self.full_repaint = True
+
+    def update_game(self):
+        """
+        Pick up the newest frame from the worker, if there is one, publish
+        its side panel values and repaint what changed. Entities are drawn
+        interpolated between the frame's step and the one before it.
+        """
+        frame = self.frame
+        if frame.generation != self.generation:
+            return  # Still the game before restart(); the new one's first frame is on its way
+        effects = self.effects
+        if frame is self.drawn_frame and not self.full_repaint and not effects and not self.animating():
+            return
+        while effects:
+            generation, event, value = effects.popleft()
+            if generation == self.generation:
+                self.particles.effect(event, value)
+        if frame.game_over and (self.drawn_frame is None or not self.drawn_frame.game_over):
+            self.publish_hud(frame, force=True)
+        else:
+            self.publish_hud(frame)
+        self.show_frame(frame)
+
+    def run_step(self):
+        """Worker thread: advance the game one step and publish a new frame."""
+        engine = self.engine
+        generation = self.sim_generation
+        if self.replay_done or engine.game_over or generation != self.generation:
+            return  # Nothing left to play, or a restart is waiting in the command queue
+        if self.replay is not None:
+            # Only the viewer's pause key matters; a paused replay stops reading input
+            self.inputs.drain()
+            if self.inputs.pause:
+                return
+        prof = self.engine.profiler
+        if prof is not None:
+            prof.begin()
+        inputs = self.take_input()
+        if prof is not None:
+            prof.lap(PHASE_INPUT)
+        if inputs is None:
+            self.replay_done = True
+            return
+        if self.recorder is not None:
+            self.recorder.record(inputs)
+        elif self.replay is None and engine.tick >= self.next_rewind_tick:
+            self.rewind.append((engine.tick, engine.snapshot()))
+            self.next_rewind_tick = engine.tick + max(1, round(REWIND_EVERY * engine.tick_rate))
+        events = engine.step(inputs)
+        if self.event_log is not None:
+            self.event_log.record(engine.tick, events)
+        self.publish_frame(prof.take() if prof is not None else None)
+        # Score, health, combo and level reach the side panel through the
+        # frame; only one-off events are handled here. Signals emitted on
+        # this thread are delivered on the GUI thread.
+        for event, value in events:
+            if event in EFFECT_EVENTS:
+                self.effects.append((generation, event, value))
+            elif event == "level_up":
+                self.levelUpSignal.emit(value)
+            elif event == "highscore":
+                self.highscore = value
+            elif event == "game_over":
+                if self.recorder is not None:
+                    self.recorder.close()
+                if self.scores is not None and self.replay is None:
+                    self.scores.submit(self.game_mode, engine.score, engine.level,
+                                       engine.scheduler.now)
+                self.gameOverSignal.emit()
+
+    def publish_hud(self, frame, force=False):
+        """Emit one signal per side panel value of frame that changed since the last publish."""
+        now = time.perf_counter()
+        if not force and now - self.hud_published < HUD_PUBLISH_INTERVAL:
+            return
+        self.hud_published = now
+        changed = self.hud.update(score=frame.score, health=frame.health,
+                                  highscore=frame.highscore, combo=frame.combo,
+                                  level=frame.level)
+        for name, value in changed.items():
+            self.hud_signals[name].emit(value)
+
+class SpectatorWidget(FrameView):
+    """Shows a game streamed by another process, see turret_spectate."""
+    def __init__(self, address, quality="auto"):
+        from turret_spectate import SpectatorClient  # asyncio is only needed here
+        super().__init__(quality)
+        self.address = address
+        self.client = SpectatorClient(address)
+        self.status = None
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.update_view)
+        self.client.start()
+        self.timer.start(FRAME_INTERVAL_MS)
+
+    def connection_status(self):
+        client = self.client
+        if client.error is not None:
+            return f"Cannot watch {self.address}: {client.error}"
+        if client.connected:
+            return None
+        return "Connection lost" if client.frame is not None else f"Waiting for {self.address}..."
+
+    def update_view(self):
+        status = self.connection_status()
+        if status != self.status:
+            self.status = status
+            self.full_repaint = True
+        frame = self.client.frame
+        if frame is None:
+            if self.full_repaint:
+                self.full_repaint = False
+                self.update()
+            return
+        if frame is self.drawn_frame and not self.full_repaint and not self.animating():
+            return
+        self.frame = frame
+        self.pause = frame.pause
+        self.show_frame(frame)
+
+    def paintEvent(self, event):
+        if self.drawn_frame is not None:
+            super().paintEvent(event)
+            if self.status is None:
+                return
+            painter = QPainter(self)
+        else:
+            painter = QPainter(self)
+            painter.fillRect(self.rect(), self.sprites.background)
+        painter.setPen(Qt.white)
+        painter.setFont(self.sprites.hud_font)
+        painter.drawText(self.rect().adjusted(0, 0, 0, -20), Qt.AlignHCenter | Qt.AlignBottom, self.status)
+        painter.end()
+
+    def stop(self):
+        self.timer.stop()
+        self.client.stop()
+
+    def closeEvent(self, event):
+        self.stop()
+        super().closeEvent(event)
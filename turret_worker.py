@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Running the simulation on its own thread.
+
+SimWorker calls a step function at the fixed tick rate on a background
+thread. After each step the game state the renderer needs is copied
+into a Frame, an immutable object, and published by swapping a single
+reference: the worker always builds the next frame in a fresh object
+while the GUI thread keeps painting the previous one, so neither side
+ever waits for the other or sees a half-updated state.
+
+Input travels the other way through InputQueue, a deque of raw events
+(append and popleft are atomic, no lock is taken) that the worker folds
+into one TickInput per step.
+"""
+
+import time
+import queue
+import threading
+from collections import deque
+
+from turret_sim import SCREEN_WIDTH, SCREEN_HEIGHT, BULLET_COLORS, ENEMY_TYPES, TickInput
+
+MAX_CATCHUP_STEPS = 8  # Steps run back to back before dropping the backlog
+
+class Frame:
+    """What the renderer needs from one simulation step. Never modified."""
+    __slots__ = ('tick', 'time', 'dt', 'turret_x', 'turret_y', 'turret_angle',
+                 'bullets', 'enemies', 'powerups', 'score', 'highscore', 'health',
+                 'combo', 'level', 'hud_message', 'hud_message_color', 'game_over', 'pause',
+                 'phases', 'generation')
+
+def capture_frame(engine, phases=None, generation=0):
+    """
+    Copy the drawable state out of engine. Entities become tuples:
+    bullets (x, y, speed_x, speed_y, color, key), enemies (x, y, speed_x,
+    speed_y, type, key) and powerups (x, y, type, color, key). The
+    key tells entities apart from one frame to the next; drawing ignores it.
+    phases are the StepTimer times of the step that produced the frame,
+    when it was profiled; generation tells frames of a restarted game from
+    those of the game before it.
+    """
+    frame = Frame()
+    frame.tick = engine.tick
+    frame.time = time.perf_counter()
+    frame.dt = engine.dt
+    turret = engine.turret
+    frame.turret_x = turret.x
+    frame.turret_y = turret.y
+    frame.turret_angle = turret.angle
+    b = engine.bullets
+    n = b.count
+    frame.bullets = tuple(zip(b.x[:n], b.y[:n], b.vx[:n], b.vy[:n],
+                              [BULLET_COLORS[kind] for kind in b.kind[:n]], b.key[:n]))
+    e = engine.enemies
+    n = e.count
+    frame.enemies = tuple(zip(e.x[:n], e.y[:n], e.vx[:n], e.vy[:n],
+                              [ENEMY_TYPES[kind] for kind in e.kind[:n]], e.key[:n]))
+    frame.powerups = tuple((p.x, p.y, p.type, p.color, id(p))
+                           for p in engine.powerups if p.active)
+    frame.score = engine.score
+    frame.highscore = engine.highscore
+    frame.health = engine.health
+    frame.combo = engine.combo_count
+    frame.level = engine.level
+    frame.hud_message = engine.hud_message
+    frame.hud_message_color = engine.hud_message_color
+    frame.game_over = engine.game_over
+    frame.pause = engine.pause
+    frame.phases = phases
+    frame.generation = generation
+    return frame
+
+class InputQueue:
+    """
+    Raw input events from the GUI thread, turned into one TickInput per
+    step on the simulation thread by take().
+    """
+    def __init__(self):
+        self.events = deque()
+        self.reset()
+
+    def reset(self):
+        self.events.clear()  # Input meant for the previous game
+        self.mouse_x = SCREEN_WIDTH // 2
+        self.mouse_y = SCREEN_HEIGHT // 2
+        self.keys = 0
+        self.clicks = 0
+        self.space_presses = 0
+        self.space_held = False
+        self.pause = False
+
+    # GUI thread
+    def put(self, kind, value=None):
+        self.events.append((kind, value))
+
+    # Simulation thread
+    def drain(self):
+        events = self.events
+        while events:
+            kind, value = events.popleft()
+            if kind == "mouse":
+                self.mouse_x, self.mouse_y = value
+            elif kind == "keys":
+                self.keys = value
+            elif kind == "click":
+                self.clicks += 1
+            elif kind == "space":
+                self.space_presses += 1
+                self.space_held = True
+            elif kind == "space_held":
+                self.space_held = value
+            elif kind == "pause":
+                self.pause = value
+
+    def take(self):
+        self.drain()
+        inputs = TickInput(self.mouse_x, self.mouse_y, self.keys, self.clicks,
+                           self.space_presses, self.space_held, self.pause)
+        self.clicks = 0
+        self.space_presses = 0
+        return inputs
+
+class SimWorker(threading.Thread):
+    """
+    Calls step() every dt seconds of real time. Callables posted with
+    call() run on the worker between steps, which is the only safe way
+    for other threads to touch the engine; once the worker has stopped
+    (or before it starts) they run right away on the caller's thread.
+    """
+    def __init__(self, step, dt, name="simulation"):
+        super().__init__(name=name, daemon=True)
+        self.step = step
+        self.dt = dt
+        self.commands = queue.SimpleQueue()
+        self.running = True
+
+    def call(self, fn):
+        if not self.is_alive():
+            fn()
+            return
+        self.commands.put(fn)
+
+    def run_commands(self):
+        while True:
+            try:
+                fn = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            fn()
+
+    def run(self):
+        next_tick = time.perf_counter()
+        while self.running:
+            self.run_commands()
+            now = time.perf_counter()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+                continue
+            steps = 0
+            while now >= next_tick:
+                if steps == MAX_CATCHUP_STEPS:
+                    # Too far behind: drop the backlog instead of spiralling
+                    next_tick = now
+                    break
+                self.step()
+                next_tick += self.dt
+                steps += 1
+
+    def stop(self):
+        self.running = False
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()